@@ -0,0 +1,382 @@
+"""Benchmark suite for the scraper and dashboard.
+
+Serves ATS payloads from a local mock HTTP server (with optional latency and
+error injection) and times the main stages: end-to-end scrape_all_companies,
+payload decoding, per-title classification, save_to_csv and the dashboard
+callback at several row counts. Results are written as JSON so runs can be
+compared.
+
+    python Benchmark.py --output bench.json
+    python Benchmark.py --fixtures recorded/ --latency 0.05 --error-rate 0.02
+
+A fixtures directory holds recorded responses as
+<fixtures>/<Greenhouse|Lever|Workable>/<board>.json; without one, payloads of
+realistic size are generated.
+"""
+import argparse
+import hashlib
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+import Decoding
+import Scraper
+from RateLimiter import HostRateLimiter
+
+DASHBOARD_SIZES = [1_000, 100_000, 1_000_000]
+MOCK_HOST_RATE = 10_000.0   # requests/second allowed against the mock server
+MOCK_WORKABLE_PAGE_SIZE = 50   # jobs per Workable page; Lever pages by skip/limit
+
+TITLES = [
+    "Software Engineer", "Senior Software Engineer", "Staff Engineer, Platform",
+    "Software Engineer II", "Junior Frontend Developer", "New Grad Software Engineer",
+    "Backend Engineer (Remote)", "Data Scientist", "Engineering Manager",
+    "DevOps Engineer", "Account Executive", "Product Designer", "Recruiter",
+    "Customer Success Manager", "Sales Development Representative", "Marketing Lead",
+]
+LOCATIONS = [
+    "Remote - US", "New York, NY", "San Francisco, CA", "London, UK", "Anywhere",
+    "Austin, TX", "Berlin, Germany", "Toronto, Canada", "Worldwide",
+]
+FILLER = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 40
+
+# ==========================================
+# 1. FIXTURES
+# ==========================================
+
+def make_board(system, board, jobs_per_board, rng):
+    """A synthetic board payload shaped like the real ATS response."""
+    day = datetime(2026, 1, 1)
+    jobs = []
+    for i in range(jobs_per_board):
+        title = rng.choice(TITLES)
+        location = rng.choice(LOCATIONS)
+        posted = day - timedelta(days=rng.randint(0, 60))
+        if system == 'Greenhouse':
+            jobs.append({
+                'id': i, 'internal_job_id': 10_000 + i, 'title': title,
+                'updated_at': posted.strftime('%Y-%m-%dT%H:%M:%S-05:00'),
+                'location': {'name': location},
+                'absolute_url': f"https://boards.greenhouse.io/{board}/jobs/{i}",
+                'company_name': board.capitalize(),
+                'metadata': None, 'data_compliance': [{'type': 'gdpr', 'requires_consent': False}],
+            })
+        elif system == 'Lever':
+            jobs.append({
+                'id': f"{board}-{i}", 'text': title,
+                'createdAt': int(posted.timestamp() * 1000),
+                'categories': {'location': location, 'team': 'Engineering', 'commitment': 'Full-time'},
+                'hostedUrl': f"https://jobs.lever.co/{board}/{i}",
+                'applyUrl': f"https://jobs.lever.co/{board}/{i}/apply",
+                'descriptionPlain': FILLER, 'lists': [{'text': 'Requirements', 'content': FILLER}],
+            })
+        else:
+            jobs.append({
+                'shortcode': f"{board[:4].upper()}{i}", 'title': title,
+                'published_on': posted.strftime('%Y-%m-%d'),
+                'location': {'country': location.split(', ')[-1], 'city': location.split(', ')[0]},
+                'url': f"https://apply.workable.com/{board}/j/{i}/",
+                'department': 'Engineering', 'employment_type': 'Full-time',
+            })
+    return jobs if system == 'Lever' else {'jobs': jobs}
+
+def load_fixtures(directory=None, boards_per_system=50, jobs_per_board=200, seed=0):
+    """Returns {system: {board: payload}} from recordings, or generated ones."""
+    fixtures = {}
+    if directory:
+        for system in Scraper.ATS_ADAPTERS:
+            path = os.path.join(directory, system)
+            if not os.path.isdir(path): continue
+            fixtures[system] = {}
+            for name in sorted(os.listdir(path)):
+                if name.endswith('.json'):
+                    with open(os.path.join(path, name), 'r') as f:
+                        fixtures[system][name[:-5]] = json.load(f)
+        return fixtures
+
+    rng = random.Random(seed)
+    for system in Scraper.ATS_ADAPTERS:
+        fixtures[system] = {
+            f"{system.lower()}{n}": make_board(system, f"{system.lower()}{n}", jobs_per_board, rng)
+            for n in range(boards_per_system)
+        }
+    return fixtures
+
+def make_jobs_frame(rows, seed=0):
+    """A classified jobs frame of the given size, built with vectorized ops."""
+    rng = np.random.default_rng(seed)
+    titles = np.array(TITLES, dtype=object)[rng.integers(0, len(TITLES), rows)]
+    locations = np.array(LOCATIONS, dtype=object)[rng.integers(0, len(LOCATIONS), rows)]
+    companies = np.char.add('company', rng.integers(0, max(rows // 50, 1), rows).astype(str)).astype(object)
+    now = pd.Timestamp.now().normalize()
+    df = pd.DataFrame({
+        'title': titles,
+        'company': companies,
+        'location': locations,
+        'url': [f"https://example.com/jobs/{i}" for i in range(rows)],
+        'source': np.array(list(Scraper.ATS_ADAPTERS), dtype=object)[rng.integers(0, 3, rows)],
+        'board': companies,
+        'posted_date': now - pd.to_timedelta(rng.integers(0, 60, rows), unit='D'),
+        'scraped_at': now.strftime('%Y-%m-%d %H:%M:%S'),
+    })
+    labels = Scraper.classifier.classify_series(df['title'], df['location'])
+    df['level'] = labels['level']
+    df['is_remote'] = labels['is_remote']
+    return df
+
+def make_raw_jobs(rows, seed=0):
+    """Unclassified scraper records, as fed to save_to_csv."""
+    df = make_jobs_frame(rows, seed)
+    df['posted_raw'] = df['posted_date'].dt.strftime('%Y-%m-%dT00:00:00Z')
+    return df[['title', 'company', 'location', 'url', 'source', 'board', 'posted_raw']].to_dict('records')
+
+# ==========================================
+# 2. MOCK ATS SERVER
+# ==========================================
+
+class MockAtsHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def respond(self, status, headers=(), body=b''):
+        """Sends the status line, headers and body in one write.
+
+        Separate writes for headers and body leave the body waiting on a
+        delayed ACK (Nagle), adding ~40ms to every response.
+        """
+        lines = [f"{self.protocol_version} {status} {self.responses[status][0]}",
+                 *(f"{name}: {value}" for name, value in headers), f"Content-Length: {len(body)}"]
+        self.wfile.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body)
+
+    def do_GET(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency * random.uniform(0.5, 1.5))
+        if server.error_rate and random.random() < server.error_rate:
+            self.respond(random.choice([429, 500, 503]), [('Retry-After', '0')])
+            return
+
+        url = urlparse(self.path)
+        page = server.page(url.path, parse_qs(url.query))
+        if page is None:
+            self.respond(404)
+            return
+        body, etag = page
+        if self.headers.get('If-None-Match') == etag:
+            self.respond(304, [('ETag', etag)])
+            return
+        self.respond(200, [('ETag', etag), ('Content-Type', 'application/json')], body)
+
+    def log_message(self, *args):
+        pass
+
+class MockAtsServer(ThreadingHTTPServer):
+    """Serves fixture payloads with ETags, one path prefix per ATS API root.
+
+    Lever boards honour skip/limit and Workable boards are split into pages
+    linked by nextPage tokens, like the real APIs.
+    """
+    daemon_threads = True
+    request_queue_size = 128   # the default backlog of 5 drops connects at scraper concurrency
+
+    def __init__(self, fixtures, latency=0.0, error_rate=0.0):
+        super().__init__(('127.0.0.1', 0), MockAtsHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.routes = {}
+        self.pages = {}
+        self._lock = threading.Lock()
+        prefixes = {'Greenhouse': '/greenhouse/{}/jobs', 'Lever': '/lever/{}',
+                    'Workable': '/workable/{}/jobs'}
+        for system, boards in fixtures.items():
+            for board, payload in boards.items():
+                self.routes[prefixes[system].format(board)] = (system, payload)
+
+    def page(self, path, query):
+        """(body, etag) for one request, or None for an unknown board."""
+        if path not in self.routes:
+            return None
+        system, payload = self.routes[path]
+        if system == 'Lever' and 'skip' in query:
+            skip, limit = int(query['skip'][0]), int(query.get('limit', ['100'])[0])
+            key, payload = (path, skip, limit), payload[skip:skip + limit]
+        elif system == 'Workable' and isinstance(payload, dict) and 'nextPage' not in payload:
+            offset = int(query.get('token', ['0'])[0])
+            end = offset + MOCK_WORKABLE_PAGE_SIZE
+            key, payload = (path, offset), {'jobs': payload.get('jobs', [])[offset:end]}
+            if end < len(self.routes[path][1].get('jobs', [])):
+                payload['nextPage'] = str(end)
+        else:
+            key = path
+        with self._lock:
+            if key not in self.pages:
+                body = json.dumps(payload).encode()
+                self.pages[key] = (body, f'"{hashlib.sha1(body).hexdigest()}"')
+            return self.pages[key]
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        Scraper.GREENHOUSE_API = f"{self.base_url}/greenhouse"
+        Scraper.LEVER_API = f"{self.base_url}/lever"
+        Scraper.WORKABLE_API = f"{self.base_url}/workable"
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+# ==========================================
+# 3. BENCHMARKS
+# ==========================================
+
+def timed(func, *args, repeat=1, **kwargs):
+    """Best wall time (seconds) over `repeat` calls, plus the last result."""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def bench_scrape(fixtures, latency, error_rate):
+    with open('companies.json', 'w') as f:
+        json.dump({system: list(boards) for system, boards in fixtures.items()}, f)
+    with MockAtsServer(fixtures, latency, error_rate):
+        # Measure the scraper itself, not the per-host rate limit for real APIs.
+        Scraper.rate_limiter = HostRateLimiter({'127.0.0.1': MOCK_HOST_RATE})
+        Scraper.response_cache.clear()
+        seconds, jobs = timed(Scraper.scrape_all_companies, deadline=None)
+        cached_seconds, _ = timed(Scraper.scrape_all_companies, deadline=None)
+    boards = sum(len(b) for b in fixtures.values())
+    return {
+        'boards': boards,
+        'jobs': len(jobs),
+        'seconds': seconds,
+        'boards_per_second': boards / seconds,
+        'jobs_per_second': len(jobs) / seconds,
+        'warm_cache_seconds': cached_seconds,
+    }
+
+def bench_decode(fixtures):
+    """Per-system decode time of the fixture payloads: stdlib json vs Decoding.decode."""
+    results = {'backend': Decoding.BACKEND}
+    for system, boards in fixtures.items():
+        bodies = [json.dumps(payload).encode() for payload in boards.values()]
+        schema = Scraper.ATS_ADAPTERS[system].schema
+        stdlib, _ = timed(lambda: [json.loads(b) for b in bodies], repeat=3)
+        fast, _ = timed(lambda: [Decoding.decode(b, schema) for b in bodies], repeat=3)
+        results[system] = {
+            'megabytes': sum(map(len, bodies)) / 1e6,
+            'stdlib_ms_per_board': stdlib / len(bodies) * 1000,
+            'fast_ms_per_board': fast / len(bodies) * 1000,
+        }
+    return results
+
+def bench_classifier(titles, locations):
+    n = len(titles)
+    scalar, _ = timed(lambda: [Scraper.classifier.classify(t, l) for t, l in zip(titles, locations)], repeat=3)
+    batch, _ = timed(Scraper.classifier.classify_series, pd.Series(titles), pd.Series(locations), repeat=3)
+    return {
+        'titles': n,
+        'scalar_us_per_title': scalar / n * 1e6,
+        'batch_us_per_title': batch / n * 1e6,
+    }
+
+def bench_save_csv(sizes):
+    results = {}
+    for rows in sizes:
+        jobs = make_raw_jobs(rows)
+        seconds, _ = timed(Scraper.save_to_csv, jobs)
+        results[str(rows)] = {'seconds': seconds, 'rows_per_second': rows / seconds}
+        for f in os.listdir('.'):
+            if f.startswith('jobs_') and f.endswith('.csv'): os.remove(f)
+    return results
+
+def bench_dashboard(sizes):
+    import Visualization
+
+    results = {}
+    for rows in sizes:
+        build, data = timed(Visualization.DashboardData, make_jobs_frame(rows))
+        cases = {
+            'all': ('all', None, 'newest'),
+            'week_mid_remote': ('week', 'Mid-Level - Remote', 'newest'),
+            'day_senior_by_company': ('day', 'Senior - All', 'company'),
+        }
+        results[str(rows)] = {'load_seconds': build}
+        for name, (date_filter, label, sort_key) in cases.items():
+            seconds, _ = timed(Visualization.render_jobs, data, date_filter, label,
+                               sort_key, 50, 0, repeat=5)
+            results[str(rows)][f"{name}_ms"] = seconds * 1000
+    return results
+
+def git_version():
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], capture_output=True,
+                              text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return None
+
+def run(fixtures_dir=None, boards=50, jobs_per_board=200, latency=0.0, error_rate=0.0,
+        sizes=DASHBOARD_SIZES):
+    """Runs every benchmark in a scratch directory and returns the report dict."""
+    report = {
+        'version': git_version(),
+        'python': platform.python_version(),
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'config': {'boards_per_system': boards, 'jobs_per_board': jobs_per_board,
+                   'latency': latency, 'error_rate': error_rate, 'sizes': sizes},
+    }
+    fixtures = load_fixtures(fixtures_dir, boards, jobs_per_board)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        try:
+            report['scrape'] = bench_scrape(fixtures, latency, error_rate)
+            report['decode'] = bench_decode(fixtures)
+            sample = make_jobs_frame(10_000)
+            report['classifier'] = bench_classifier(sample['title'].tolist(), sample['location'].tolist())
+            report['save_to_csv'] = bench_save_csv(sizes)
+            report['dashboard'] = bench_dashboard(sizes)
+        finally:
+            os.chdir(cwd)
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scraper and dashboard.")
+    parser.add_argument('--fixtures', help="directory of recorded <system>/<board>.json payloads")
+    parser.add_argument('--boards', type=int, default=50, help="generated boards per ATS")
+    parser.add_argument('--jobs-per-board', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.0, help="mean mock response delay (s)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of 429/5xx responses")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DASHBOARD_SIZES,
+                        help="row counts for the save and dashboard benchmarks")
+    parser.add_argument('--output', help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run(args.fixtures, args.boards, args.jobs_per_board, args.latency,
+                 args.error_rate, args.sizes)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Command line entry point.
+
+    python Cli.py scrape                   # scrape due boards into the job store
+    python Cli.py scrape --csv             # every board, to a timestamped CSV
+    python Cli.py serve --port 8050        # run the dashboard
+    python Cli.py export --format parquet  # dump open jobs from the store
+    python Cli.py bench --sizes 1000       # benchmark suite (see Benchmark.py)
+    python Cli.py shard run --shard 0 --of 8
+
+Each subcommand imports what it needs when it runs, so starting the CLI
+(e.g. from cron, once per shard) doesn't pay for pandas, dash or plotly
+unless the command uses them.
+"""
+import argparse
+import sys
+from datetime import datetime
+
+def scrape(args):
+    import Scraper
+    Scraper.GREENHOUSE_DESCRIPTIONS = args.descriptions
+    sink = Scraper.CsvSink() if args.csv else Scraper.StoreSink(args.store or Scraper.STORE_PATH)
+    # A CSV is read back as the complete job set, so it always covers every board.
+    Scraper.main(sink, scheduled=not (args.all or args.csv), metrics_path=args.prometheus,
+                 report_path=args.report or Scraper.RUN_REPORT_PATH)
+
+def serve(args):
+    import Visualization
+    Visualization.create_app(watch=not args.no_reload).run(host=args.host, port=args.port, debug=args.debug)
+
+def export(args):
+    from HiddenJobs import HiddenJobs
+    from JobStore import JobStore, STORE_PATH
+    with JobStore(args.store or STORE_PATH) as store:
+        df = store.open_jobs()
+    with HiddenJobs() as hidden:
+        df = hidden.drop(df)
+    output = args.output or f"jobs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{args.format}"
+    if args.format == 'parquet':
+        from Scraper import to_typed_frame
+        to_typed_frame(df).to_parquet(output, index=False)
+    else:
+        df.to_csv(output, index=False)
+    print(f"Exported {len(df)} jobs to {output}")
+
+def bench(args):
+    import Benchmark
+    Benchmark.main(args.extra)
+
+def shard(args):
+    import Sharding
+    Sharding.main(args.extra)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='Cli.py', description="Job scraper and dashboard.")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('scrape', help="scrape all boards")
+    p.add_argument('--all', action='store_true', help="fetch every board, not just the due ones")
+    p.add_argument('--csv', action='store_true', help="write a CSV of every board instead of updating the job store (implies --all)")
+    p.add_argument('--store', help="job store path (default: jobs.db)")
+    p.add_argument('--descriptions', action='store_true',
+                   help="also fetch Greenhouse descriptions, so search covers them")
+    p.add_argument('--report', help="run report path (default: run_report.json)")
+    p.add_argument('--prometheus', help="also write run metrics for the node_exporter textfile collector")
+    p.set_defaults(func=scrape)
+
+    p = sub.add_parser('serve', help="run the dashboard")
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=8050)
+    p.add_argument('--debug', action='store_true')
+    p.add_argument('--no-reload', action='store_true', help="don't watch for new data")
+    p.set_defaults(func=serve)
+
+    p = sub.add_parser('export', help="export open jobs from the job store")
+    p.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+    p.add_argument('--store', help="job store path (default: jobs.db)")
+    p.add_argument('--output', help="output file (default: timestamped jobs_*.<format>)")
+    p.set_defaults(func=export)
+
+    # These forward their options to the module's own argument parser.
+    sub.add_parser('bench', help="run the benchmark suite", add_help=False).set_defaults(func=bench)
+    sub.add_parser('shard', help="sharded scraping (see Sharding.py)", add_help=False).set_defaults(func=shard)
+
+    args, extra = parser.parse_known_args(argv)
+    if extra and args.command not in ('bench', 'shard'):
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    args.extra = extra
+    args.func(args)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,39 @@
+"""JSON decoding for board payloads, using an accelerated library when installed.
+
+With msgspec, a payload is decoded against the adapter's schema (a
+TypedDict of just the fields the parser reads), so descriptions, lists and
+other unused fields are skipped without being turned into Python objects.
+Without a schema, or when the payload doesn't fit it, the whole document is
+decoded with orjson, falling back to the stdlib json module.
+"""
+import json
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = 'msgspec' if msgspec else 'orjson' if orjson else 'json'
+
+_decoders = {}
+
+def loads(body):
+    """Decodes a whole JSON document."""
+    return orjson.loads(body) if orjson else json.loads(body)
+
+def decode(body, schema=None):
+    """Decodes a payload, keeping only `schema`'s fields when msgspec is available."""
+    if msgspec is not None and schema is not None:
+        decoder = _decoders.get(schema)
+        if decoder is None:
+            decoder = _decoders[schema] = msgspec.json.Decoder(schema)
+        try:
+            return decoder.decode(body)
+        except msgspec.ValidationError:
+            pass  # unexpected shape: decode everything and let the parser cope
+    return loads(body)
@@ -0,0 +1,234 @@
+"""Cross-source fuzzy deduplication of postings.
+
+The same role often shows up on several boards (and again when it is
+reposted) with slightly different company names, titles and locations.
+Records are compared on normalized keys, blocked by company, and near
+duplicate titles are found with MinHash / LSH so each record is only
+checked against a handful of candidates. Every posting gets a canonical
+job_id that is reused across runs through the job store.
+"""
+import hashlib
+import re
+from itertools import islice
+
+import numpy as np
+
+COMPANY_SUFFIXES = {'inc', 'llc', 'ltd', 'limited', 'corp', 'corporation', 'co',
+                    'company', 'gmbh', 'plc', 'sa', 'ag', 'bv', 'the'}
+TITLE_ABBREVIATIONS = {
+    'sr': 'senior', 'snr': 'senior', 'jr': 'junior', 'eng': 'engineer', 'engr': 'engineer',
+    'swe': 'software engineer', 'sde': 'software engineer', 'dev': 'developer',
+    'mgr': 'manager', 'mgmt': 'management', 'ml': 'machine learning',
+}
+TITLE_NOISE = {'remote', 'hybrid', 'onsite', 'on', 'site', 'm', 'f', 'd', 'w', 'x'}
+# Tokens that make two otherwise similar titles different jobs.
+LEVEL_TOKENS = {'i', 'ii', 'iii', 'iv', 'v', '1', '2', '3', '4', '5', 'intern', 'junior',
+                'senior', 'staff', 'principal', 'lead', 'manager', 'director', 'head'}
+# Country-only locations (Workable lists just the country) match any location;
+# any other pair of locations has to name the same city.
+BROAD_LOCATIONS = {'', 'us', 'usa', 'united states', 'united states of america', 'uk',
+                   'united kingdom', 'canada', 'germany', 'france', 'india', 'ireland',
+                   'netherlands', 'spain', 'australia', 'anywhere', 'worldwide', 'global'}
+
+NUM_PERM = 32
+BANDS, ROWS = 8, 4          # LSH picks up pairs from a title similarity of roughly 0.6
+TITLE_SIMILARITY = 0.8      # trigram Jaccard needed to call two titles the same
+_MERSENNE = (1 << 31) - 1
+_rng = np.random.default_rng(20240101)
+_PERM_A = _rng.integers(1, _MERSENNE, NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, _MERSENNE, NUM_PERM, dtype=np.uint64)
+_BAND_MIX = _rng.integers(1, 1 << 62, ROWS, dtype=np.uint64)
+SIGNATURE_BATCH = 500       # records hashed together in one vectorized pass
+MAX_BUCKET_CANDIDATES = 64  # earliest postings scored per LSH bucket; keeps huge buckets cheap
+# Index scopes next to the city names: every posting, and broad-location postings.
+_ANY, _BROAD = ('any',), ('broad',)
+
+WORD_RE = re.compile(r'[a-z0-9+#]+')
+LOCATION_PARTS_RE = re.compile(r'[,;/|()]|\s-\s')
+
+def normalize_company(name):
+    tokens = [t for t in WORD_RE.findall((name or '').lower()) if t not in COMPANY_SUFFIXES]
+    return ''.join(tokens)
+
+def normalize_title(title):
+    tokens = []
+    for t in WORD_RE.findall((title or '').lower().replace('&', ' and ')):
+        if t in TITLE_NOISE: continue
+        tokens.extend(TITLE_ABBREVIATIONS.get(t, t).split())
+    return ' '.join(tokens)
+
+def normalize_location(location):
+    """Location parts, most specific first: "San Jose, CA" -> ('san jose', 'ca')."""
+    parts = (' '.join(WORD_RE.findall(p)) for p in LOCATION_PARTS_RE.split((location or '').lower()))
+    return tuple(p for p in parts if p)
+
+def is_broad(location):
+    return all(part in BROAD_LOCATIONS for part in location)
+
+def locations_compatible(a, b):
+    """Same city (the first part), or one side is only a country / "anywhere".
+
+    States and countries after the city are left out, so "San Jose, CA" and
+    "San Francisco, CA" don't match on "ca".
+    """
+    if is_broad(a) or is_broad(b):
+        return True
+    return a[0] == b[0]
+
+def shingles(text):
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)} or {padded}
+
+def band_keys(gram_sets):
+    """LSH band keys for many shingle sets at once: one row of BANDS ints per set.
+
+    MinHash signatures for the whole batch come out of a single reduceat over
+    the concatenated shingle hashes, and each band of ROWS values is folded
+    into one int. str hashes are salted per process, which is fine since
+    band keys are never persisted.
+    """
+    sizes = np.fromiter(map(len, gram_sets), dtype=np.int64, count=len(gram_sets))
+    hashes = np.array([hash(g) for grams in gram_sets for g in grams], dtype=np.int64)
+    hashes = hashes.astype(np.uint64) % _MERSENNE
+    permuted = (np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % _MERSENNE
+    offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    signatures = np.minimum.reduceat(permuted, offsets, axis=1).T
+    return (signatures.reshape(len(gram_sets), BANDS, ROWS) * _BAND_MIX).sum(axis=2).tolist()
+
+def sign(entries):
+    """Fills in the band keys of entries that don't have them yet."""
+    entries = [e for e in entries if e.band_keys is None]
+    if entries:
+        for entry, keys in zip(entries, band_keys([e.grams for e in entries])):
+            entry.band_keys = list(enumerate(keys))
+
+def new_job_id(url):
+    """Canonical ID for a posting first seen at `url`."""
+    return hashlib.sha1(url.encode()).hexdigest()[:16]
+
+class _Entry:
+    __slots__ = ('job_id', 'title', 'location', 'city', 'grams', 'levels', 'band_keys')
+
+    def __init__(self, job_id, title, location):
+        self.job_id = job_id
+        self.title = normalize_title(title)
+        self.location = normalize_location(location)
+        self.city = None if is_broad(self.location) else self.location[0]
+        self.grams = shingles(self.title)
+        self.levels = LEVEL_TOKENS.intersection(self.title.split())
+        self.band_keys = None
+
+    def matches(self, other):
+        if self.levels != other.levels or not locations_compatible(self.location, other.location):
+            return 0.0
+        if self.title == other.title:
+            return 1.0
+        similarity = len(self.grams & other.grams) / len(self.grams | other.grams)
+        return similarity if similarity >= TITLE_SIMILARITY else 0.0
+
+class _Block:
+    """All known postings of one normalized company, with their LSH buckets.
+
+    Postings from earlier runs are only hashed once a record of the same
+    company comes in, so a run pays for the companies it actually scraped.
+    Entries must be signed (see sign) before they are added or looked up.
+
+    Titles and buckets are keyed by city as well, so a posting is only
+    compared with postings it could match: ones in its own city, plus those
+    with a broad location. A broad posting looks across every city.
+    """
+
+    def __init__(self):
+        self.unindexed = []
+        self.titles = {}
+        self.buckets = {}
+
+    @staticmethod
+    def _scopes(entry):
+        """Index scopes an entry is filed under, and the ones it is looked up in."""
+        if entry.city is None:
+            return (_ANY, _BROAD), (_ANY,)
+        return (_ANY, entry.city), (entry.city, _BROAD)
+
+    def add(self, entry, lazy=False):
+        if lazy:
+            self.unindexed.append(entry)
+            return
+        for scope in self._scopes(entry)[0]:
+            self.titles.setdefault((scope, entry.title), []).append(entry)
+            for key in entry.band_keys:
+                self.buckets.setdefault((scope, key), []).append(entry)
+
+    def find(self, entry):
+        if self.unindexed:
+            sign(self.unindexed)
+            for known in self.unindexed:
+                self.add(known)
+            self.unindexed = []
+        scopes = self._scopes(entry)[1]
+        for scope in scopes:
+            for c in self.titles.get((scope, entry.title), ()):
+                if c.matches(entry):
+                    return c
+        candidates = {id(c): c for scope in scopes for key in entry.band_keys
+                      for c in islice(self.buckets.get((scope, key), ()), MAX_BUCKET_CANDIDATES)}
+        scored = [(c.matches(entry), c) for c in candidates.values()]
+        best = max(scored, key=lambda s: s[0], default=(0.0, None))
+        return best[1] if best[0] else None
+
+class Deduplicator:
+    """Assigns canonical job IDs and drops near-duplicate postings within a run.
+
+    `known` are (url, job_id, title, company, location) rows from earlier
+    runs: a posting seen at a known URL keeps its ID, and a near duplicate of
+    a known posting (a repost, or the same role on another board) inherits it.
+    """
+
+    def __init__(self, known=()):
+        self.known_urls = {}
+        self.blocks = {}
+        for url, job_id, title, company, location in known:
+            job_id = job_id or new_job_id(url)
+            self.known_urls[url] = job_id
+            self._block(company).add(_Entry(job_id, title, location), lazy=True)
+
+    def _block(self, company):
+        key = normalize_company(company)
+        if key not in self.blocks:
+            self.blocks[key] = _Block()
+        return self.blocks[key]
+
+    def dedupe(self, records):
+        """Yields records with a job_id, skipping duplicates of ones already yielded.
+
+        A new URL that matches a known posting is held back until the end of
+        the stream and only yielded if that posting's own URL didn't show up,
+        so the known URL stays the canonical one.
+        """
+        emitted, pending = set(), {}
+        records = iter(records)
+        while chunk := list(islice(records, SIGNATURE_BATCH)):
+            entries = [_Entry(None, job['title'], job['location']) for job in chunk]
+            sign([e for job, e in zip(chunk, entries) if job['url'] not in self.known_urls])
+            for job, entry in zip(chunk, entries):
+                if job['url'] in self.known_urls:
+                    entry.job_id = self.known_urls[job['url']]
+                else:
+                    block = self._block(job['company'])
+                    match = block.find(entry)
+                    if match is None:
+                        entry.job_id = new_job_id(job['url'])
+                        block.add(entry)
+                    elif match.job_id not in emitted:
+                        pending.setdefault(match.job_id, job)
+                        continue
+                    else:
+                        continue
+                if entry.job_id in emitted: continue
+                emitted.add(entry.job_id)
+                pending.pop(entry.job_id, None)
+                yield {**job, 'job_id': entry.job_id}
+
+        for job_id, job in pending.items():
+            if job_id not in emitted:
+                yield {**job, 'job_id': job_id}
@@ -0,0 +1,89 @@
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+HIDDEN_PATH = 'hidden_jobs.db'
+LEGACY_HIDDEN_PATH = 'hidden_jobs.json'
+LOOKUP_CHUNK = 500   # URLs per IN (...) membership query
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hidden_jobs (
+    url TEXT PRIMARY KEY,
+    hidden_at TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+class HiddenJobs:
+    """URLs the user has hidden from the dashboard, in a small SQLite table.
+
+    Membership is a primary-key lookup and hiding a job is a single insert,
+    so neither side has to read or rewrite the whole set. A leftover
+    hidden_jobs.json from older versions is imported once and renamed.
+    """
+
+    def __init__(self, path=HIDDEN_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self._import_legacy()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __contains__(self, url):
+        return self.conn.execute("SELECT 1 FROM hidden_jobs WHERE url = ?", (url,)).fetchone() is not None
+
+    def __len__(self):
+        return self.conn.execute("SELECT count(*) FROM hidden_jobs").fetchone()[0]
+
+    def hide(self, urls, hidden_at=None):
+        """Adds URLs to the hidden set. Returns how many were newly hidden."""
+        hidden_at = hidden_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with self.conn:
+            cur = self.conn.executemany("INSERT OR IGNORE INTO hidden_jobs (url, hidden_at) VALUES (?, ?)",
+                                        [(url, hidden_at) for url in urls])
+        return cur.rowcount
+
+    def unhide(self, urls):
+        with self.conn:
+            cur = self.conn.executemany("DELETE FROM hidden_jobs WHERE url = ?", [(url,) for url in urls])
+        return cur.rowcount
+
+    def hidden_among(self, urls):
+        """The subset of `urls` that is hidden."""
+        urls = list(dict.fromkeys(urls))
+        hidden = set()
+        for i in range(0, len(urls), LOOKUP_CHUNK):
+            chunk = urls[i:i + LOOKUP_CHUNK]
+            rows = self.conn.execute(f"SELECT url FROM hidden_jobs WHERE url IN ({', '.join('?' * len(chunk))})", chunk)
+            hidden.update(url for url, in rows)
+        return hidden
+
+    def drop(self, df):
+        """Drops rows of a jobs frame whose URL is hidden."""
+        if df.empty:
+            return df
+        hidden = self.hidden_among(df['url'])
+        return df[~df['url'].isin(hidden)] if hidden else df
+
+    def _import_legacy(self):
+        if not os.path.exists(LEGACY_HIDDEN_PATH):
+            return
+        try:
+            with open(LEGACY_HIDDEN_PATH, 'r') as f:
+                urls = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.hide(urls)
+        try:
+            os.replace(LEGACY_HIDDEN_PATH, LEGACY_HIDDEN_PATH + '.imported')
+        except FileNotFoundError:
+            pass   # another process (e.g. a parallel shard) imported it first
@@ -0,0 +1,311 @@
+import re
+import sqlite3
+from datetime import datetime
+
+STORE_PATH = 'jobs.db'
+
+JOB_COLUMNS = [
+    'url', 'title', 'company', 'location', 'source',
+    'level', 'is_remote', 'posted_date', 'scraped_at', 'job_id', 'board',
+]
+
+# Closed postings stay candidates for repost matching this long.
+REPOST_WINDOW_DAYS = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    url TEXT PRIMARY KEY,
+    title TEXT,
+    company TEXT,
+    location TEXT,
+    source TEXT,
+    level TEXT,
+    is_remote INTEGER,
+    posted_date TEXT,
+    scraped_at TEXT,
+    job_id TEXT,
+    board TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    closed_at TEXT,
+    changed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_open ON jobs (closed_at);
+"""
+# Created after the column migrations below, since older stores lack the columns.
+BOARD_INDEX = "CREATE INDEX IF NOT EXISTS jobs_by_board ON jobs (source, board)"
+CHANGED_INDEX = "CREATE INDEX IF NOT EXISTS jobs_changed ON jobs (changed_at)"
+# Columns whose change moves a row's changed_at; scraped_at moves every run.
+TRACKED_COLUMNS = [c for c in JOB_COLUMNS[1:] if c != 'scraped_at']
+
+# Board slug in the posting URL of ATS-hosted job pages, for rows stored
+# before the board column existed.
+BOARD_URL_RE = re.compile(r'https?://(?:[\w-]+\.)*(?:greenhouse\.io|lever\.co|workable\.com)/([^/?#]+)/')
+
+# One row per day and (company, source, level, is_remote): postings open at
+# the end of the day, and postings first seen / closed that day.
+ROLLUP_SCHEMA = """
+CREATE TABLE daily_rollups (
+    day TEXT NOT NULL,
+    company TEXT NOT NULL,
+    source TEXT NOT NULL,
+    level TEXT NOT NULL,
+    is_remote INTEGER NOT NULL,
+    open INTEGER NOT NULL,
+    opened INTEGER NOT NULL,
+    closed INTEGER NOT NULL,
+    PRIMARY KEY (day, company, source, level, is_remote)
+) WITHOUT ROWID;
+"""
+
+# Full-text index over the searchable text of each job, keyed by jobs.rowid.
+# '+' and '#' are token characters so "c++" and "c#" stay searchable.
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE jobs_fts USING fts5(
+    title, company, location, description,
+    tokenize = "unicode61 tokenchars '+#'"
+);
+"""
+FTS_COLUMNS = ['title', 'company', 'location', 'description']
+# bm25 column weights: a hit in the title outranks one in the description.
+FTS_WEIGHTS = (10.0, 5.0, 2.0, 1.0)
+SEARCH_LIMIT = 500
+LOOKUP_CHUNK = 500   # URLs per IN (...) query
+
+TAG_RE = re.compile(r'<[^>]+>')
+TERM_RE = re.compile(r'(?:(\w+):)?("[^"]*"|\S+)')
+
+def plain_text(text):
+    """Strips HTML tags from a description before indexing."""
+    return TAG_RE.sub(' ', text) if text else None
+
+def fts_query(text):
+    """Turns a search box string into an FTS5 query.
+
+    Words are ANDed and prefix-matched; "quoted phrases" match exactly and
+    company:/location:/title: restrict a term to one column.
+    """
+    terms = []
+    for column, term in TERM_RE.findall(text):
+        phrase = term.strip('"').replace('"', ' ').strip()
+        if not phrase: continue
+        term = f'"{phrase}"' if term.startswith('"') else f'"{phrase}"*'
+        terms.append(f'{column.lower()} : {term}' if column.lower() in FTS_COLUMNS else term)
+    return ' AND '.join(terms)
+
+class JobStore:
+    """Persistent SQLite store of postings, keyed by job URL.
+
+    Each run upserts what it saw (keeping first_seen, bumping last_seen) and
+    closes open postings of the boards it fetched that were not seen again.
+    Boards are (source, board slug) pairs, as in companies.json. changed_at
+    only moves when a row is added, closed, reopened or its content changes,
+    so readers can pick up just what a run changed (see changes_since).
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+        if 'job_id' not in columns:
+            self.conn.execute("ALTER TABLE jobs ADD COLUMN job_id TEXT")
+        if 'board' not in columns:
+            self.conn.execute("ALTER TABLE jobs ADD COLUMN board TEXT")
+            self._backfill_boards()
+        if 'changed_at' not in columns:
+            self.conn.execute("ALTER TABLE jobs ADD COLUMN changed_at TEXT")
+            with self.conn:
+                self.conn.execute("UPDATE jobs SET changed_at = max(last_seen, coalesce(closed_at, ''))")
+        self.conn.execute(BOARD_INDEX)
+        self.conn.execute(CHANGED_INDEX)
+        if not self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'jobs_fts'").fetchone():
+            self._build_index()
+        if not self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'daily_rollups'").fetchone():
+            self._build_rollups()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def upsert(self, jobs, seen_at):
+        rows = [tuple(job.get(c) for c in JOB_COLUMNS) + (seen_at, seen_at, seen_at) for job in jobs]
+        changed = ' OR '.join(f'jobs.{c} IS NOT excluded.{c}' for c in TRACKED_COLUMNS)
+        with self.conn:
+            indexed = self._indexed_text([job['url'] for job in jobs])
+            self.conn.executemany(f"""
+                INSERT INTO jobs ({', '.join(JOB_COLUMNS)}, first_seen, last_seen, changed_at)
+                VALUES ({', '.join('?' * (len(JOB_COLUMNS) + 3))})
+                ON CONFLICT(url) DO UPDATE SET
+                    {', '.join(f'{c}=excluded.{c}' for c in JOB_COLUMNS[1:])},
+                    last_seen=excluded.last_seen,
+                    changed_at=CASE WHEN jobs.closed_at IS NOT NULL OR {changed}
+                                    THEN excluded.changed_at ELSE jobs.changed_at END,
+                    closed_at=NULL
+            """, rows)
+            self._index(jobs, indexed)
+        return len(rows)
+
+    def _build_index(self):
+        with self.conn:
+            self.conn.executescript(FTS_SCHEMA)
+            self.conn.execute("""
+                INSERT INTO jobs_fts (rowid, title, company, location)
+                SELECT rowid, title, company, location FROM jobs
+            """)
+
+    def _lookup(self, columns, urls):
+        """url -> (rowid, *columns) for the given URLs that are in the store."""
+        found = {}
+        for i in range(0, len(urls), LOOKUP_CHUNK):
+            chunk = urls[i:i + LOOKUP_CHUNK]
+            rows = self.conn.execute(f"""
+                SELECT url, {', '.join(['rowid'] + columns)} FROM jobs
+                WHERE url IN ({', '.join('?' * len(chunk))})
+            """, chunk)
+            found.update((url, tuple(rest)) for url, *rest in rows)
+        return found
+
+    def _indexed_text(self, urls):
+        return self._lookup(FTS_COLUMNS[:3], urls)
+
+    def _index(self, jobs, indexed):
+        # Only new jobs and jobs whose text changed touch the index. A job
+        # re-indexed without a description keeps the one fetched earlier.
+        rowids = self._lookup([], [job['url'] for job in jobs if job['url'] not in indexed])
+        new, changed = [], []
+        for job in jobs:
+            text = (job.get('title'), job.get('company'), job.get('location'))
+            description = plain_text(job.get('description'))
+            if job['url'] in rowids:
+                new.append((rowids[job['url']][0], *text, description))
+            elif description or indexed[job['url']][1:] != text:
+                changed.append((indexed[job['url']][0], *text, description))
+        self.conn.executemany("""
+            INSERT INTO jobs_fts (rowid, title, company, location, description) VALUES (?, ?, ?, ?, ?)
+        """, new)
+        self.conn.executemany("""
+            INSERT OR REPLACE INTO jobs_fts (rowid, title, company, location, description)
+            VALUES (?1, ?2, ?3, ?4, coalesce(?5, (SELECT description FROM jobs_fts WHERE rowid = ?1)))
+        """, changed)
+
+    def _backfill_boards(self):
+        # Rows whose URL doesn't carry the slug get their board when next seen.
+        rows = self.conn.execute("SELECT rowid, url FROM jobs WHERE board IS NULL").fetchall()
+        slugs = [(m.group(1), rowid) for rowid, url in rows if (m := BOARD_URL_RE.match(url or ''))]
+        with self.conn:
+            self.conn.executemany("UPDATE jobs SET board = ? WHERE rowid = ?", slugs)
+
+    def close_missing(self, boards, seen_at):
+        """Closes open jobs of the given (source, board) pairs not seen at seen_at."""
+        with self.conn:
+            cur = self.conn.executemany("""
+                UPDATE jobs SET closed_at = ?, changed_at = ?
+                WHERE closed_at IS NULL AND last_seen != ? AND source = ? AND board = ?
+            """, [(seen_at, seen_at, seen_at, source, board) for source, board in boards])
+        return cur.rowcount
+
+    def sync(self, jobs, boards, seen_at=None):
+        """Records one run's postings. Returns (upserted, closed).
+
+        `boards` are the (source, board) pairs fetched successfully this run;
+        only their jobs are considered for closing, so a board whose request
+        failed keeps its jobs open, while one that now lists nothing is emptied.
+        """
+        seen_at = seen_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        upserted = self.upsert(jobs, seen_at)
+        closed = self.close_missing(boards, seen_at)
+        self.rollup(seen_at[:10])
+        return upserted, closed
+
+    # --- Daily rollups ---
+
+    def rollup(self, day=None):
+        """(Re)computes the rollup rows of one day (default: today) from the jobs table."""
+        day = day or datetime.now().strftime('%Y-%m-%d')
+        end = f"{day} 23:59:59"
+        with self.conn:
+            self.conn.execute("DELETE FROM daily_rollups WHERE day = ?", (day,))
+            self.conn.execute("""
+                INSERT INTO daily_rollups
+                SELECT :day, coalesce(company, ''), coalesce(source, ''), coalesce(level, ''),
+                       coalesce(is_remote, 0),
+                       sum(closed_at IS NULL OR closed_at > :end),
+                       sum(substr(first_seen, 1, 10) = :day),
+                       coalesce(sum(substr(closed_at, 1, 10) = :day), 0)
+                FROM jobs
+                WHERE first_seen <= :end AND (closed_at IS NULL OR closed_at >= :day)
+                GROUP BY 2, 3, 4, 5
+            """, {'day': day, 'end': end})
+
+    def _build_rollups(self):
+        # Backfill every day a run touched the store, so existing history shows up.
+        with self.conn:
+            self.conn.executescript(ROLLUP_SCHEMA)
+        days = self.conn.execute("""
+            SELECT substr(first_seen, 1, 10) FROM jobs
+            UNION SELECT substr(last_seen, 1, 10) FROM jobs
+            UNION SELECT substr(closed_at, 1, 10) FROM jobs WHERE closed_at IS NOT NULL
+        """).fetchall()
+        for day, in days:
+            self.rollup(day)
+
+    def rollups(self, since=None):
+        """Rollup rows from `since` (a YYYY-MM-DD day) on, as a DataFrame."""
+        import pandas as pd
+
+        df = pd.read_sql_query("""
+            SELECT * FROM daily_rollups WHERE day >= ? ORDER BY day
+        """, self.conn, params=(since or '',))
+        df['day'] = pd.to_datetime(df['day'])
+        df['is_remote'] = df['is_remote'].astype(bool)
+        return df
+
+    def _frame(self, where, params=()):
+        import pandas as pd
+
+        df = pd.read_sql_query(f"""
+            SELECT {', '.join(JOB_COLUMNS)}, first_seen, last_seen, closed_at FROM jobs
+            WHERE {where} ORDER BY last_seen DESC
+        """, self.conn, params=params)
+        df['is_remote'] = df['is_remote'].astype(bool)
+        df['posted_date'] = pd.to_datetime(df['posted_date'], errors='coerce')
+        return df
+
+    def open_jobs(self):
+        return self._frame("closed_at IS NULL").drop(columns='closed_at')
+
+    def changes_since(self, since):
+        """Jobs added, changed, closed or reopened at or after `since` (a watermark)."""
+        return self._frame("changed_at >= ?", (since,))
+
+    def search(self, text, limit=SEARCH_LIMIT):
+        """URLs of open jobs matching a search string, best match first."""
+        query = fts_query(text)
+        if not query:
+            return []
+        rows = self.conn.execute(f"""
+            SELECT j.url FROM jobs_fts
+            JOIN jobs j ON j.rowid = jobs_fts.rowid
+            WHERE jobs_fts MATCH ? AND j.closed_at IS NULL
+            ORDER BY bm25(jobs_fts, {', '.join(map(str, FTS_WEIGHTS))})
+            LIMIT ?
+        """, (query, limit))
+        return [url for url, in rows]
+
+    def dedup_candidates(self, window_days=REPOST_WINDOW_DAYS):
+        """(url, job_id, title, company, location) of open and recently closed jobs."""
+        return self.conn.execute("""
+            SELECT url, job_id, title, company, location FROM jobs
+            WHERE closed_at IS NULL OR closed_at >= datetime('now', 'localtime', ?)
+        """, (f'-{window_days} days',)).fetchall()
+
+    def watermark(self):
+        """Latest changed_at in the store, for use with changes_since."""
+        return self.conn.execute("SELECT max(changed_at) FROM jobs").fetchone()[0]
@@ -0,0 +1,150 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+RUN_REPORT_PATH = 'run_report.json'
+
+# Timed stages of a board fetch: waiting for a request slot and the host's
+# rate limiter (Retry-After included), request to response headers, body
+# download, JSON decoding, parsing / relevance filtering, and fetching
+# per-posting descriptions. DNS and TCP/TLS connect aren't exposed by
+# requests, so they are part of `ttfb` whenever a new connection is opened.
+STAGES = ('wait', 'ttfb', 'download', 'json_parse', 'parse', 'descriptions')
+
+_local = threading.local()
+
+def current_board():
+    """Metrics dict of the board being scraped on this thread, or None."""
+    return getattr(_local, 'board', None)
+
+class RunMetrics:
+    """Per-board timings, row counts and error/retry counters for one scrape run.
+
+    Boards that finish after finish() (left running past the deadline, their
+    rows discarded) are not recorded.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.finished_at = None
+        self.boards = []
+        self.skipped = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def board(self, system, company):
+        m = {
+            'system': system, 'board': company, 'status': 'ok',
+            'http_status': None, 'error': None, 'retries': 0, 'throttled': 0, 'bytes': 0,
+            'kept': 0, 'discarded': 0, 'description_errors': 0, **{stage: 0.0 for stage in STAGES},
+        }
+        _local.board = m
+        start = time.perf_counter()
+        try:
+            yield m
+        except Exception as e:
+            m['status'] = 'error'
+            m['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            m['seconds'] = time.perf_counter() - start
+            _local.board = None
+            with self._lock:
+                if self.finished_at is None:
+                    self.boards.append(m)
+
+    def finish(self):
+        with self._lock:
+            self.finished_at = time.time()
+
+    def recorded(self):
+        """A snapshot of the boards recorded so far."""
+        with self._lock:
+            return list(self.boards)
+
+    def summary(self, boards=None):
+        """Totals per ATS system."""
+        systems = {}
+        for m in self.recorded() if boards is None else boards:
+            s = systems.setdefault(m['system'], {
+                'boards': 0, 'statuses': {}, 'retries': 0, 'throttled': 0, 'bytes': 0,
+                'kept': 0, 'discarded': 0, 'description_errors': 0, 'seconds': 0.0,
+                **{stage: 0.0 for stage in STAGES},
+            })
+            s['boards'] += 1
+            s['statuses'][m['status']] = s['statuses'].get(m['status'], 0) + 1
+            for key in ('retries', 'throttled', 'bytes', 'kept', 'discarded', 'description_errors',
+                        'seconds') + STAGES:
+                s[key] += m[key]
+        return systems
+
+    def report(self):
+        finished_at = self.finished_at or time.time()
+        boards = self.recorded()
+        return {
+            'started_at': self.started_at,
+            'duration_seconds': finished_at - self.started_at,
+            'skipped_boards': self.skipped,
+            'summary': self.summary(boards),
+            'boards': boards,
+        }
+
+    def write_report(self, path=RUN_REPORT_PATH):
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def prometheus_text(self):
+        """The run summary in Prometheus text exposition format (textfile collector)."""
+        report = self.report()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        summary = report['summary']
+        metric('scraper_run_timestamp_seconds', 'gauge', "Start time of the last scrape run.",
+               [({}, report['started_at'])])
+        metric('scraper_run_duration_seconds', 'gauge', "Wall-clock duration of the last scrape run.",
+               [({}, report['duration_seconds'])])
+        metric('scraper_skipped_boards', 'gauge', "Boards dropped at the run deadline.",
+               [({}, report['skipped_boards'])])
+        metric('scraper_boards', 'gauge', "Boards fetched, by outcome.",
+               [({'system': system, 'status': status}, n)
+                for system, s in summary.items() for status, n in s['statuses'].items()])
+        metric('scraper_stage_seconds', 'gauge', "Time spent per fetch stage, summed over boards.",
+               [({'system': system, 'stage': stage}, s[stage])
+                for system, s in summary.items() for stage in STAGES])
+        metric('scraper_rows', 'gauge', "Postings kept or discarded by the role filter.",
+               [({'system': system, 'outcome': outcome}, s[outcome])
+                for system, s in summary.items() for outcome in ('kept', 'discarded')])
+        metric('scraper_retries', 'gauge', "urllib3 retries performed.",
+               [({'system': system}, s['retries']) for system, s in summary.items()])
+        metric('scraper_throttled', 'gauge', "429 responses waited out via Retry-After.",
+               [({'system': system}, s['throttled']) for system, s in summary.items()])
+        metric('scraper_description_errors', 'gauge', "Posting descriptions that failed to fetch.",
+               [({'system': system}, s['description_errors']) for system, s in summary.items()])
+        metric('scraper_response_bytes', 'gauge', "Response body bytes downloaded.",
+               [({'system': system}, s['bytes']) for system, s in summary.items()])
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp, path)
+
+    def print_summary(self):
+        for system, s in self.summary().items():
+            truncated = s['statuses'].get('truncated', 0)
+            failed = s['boards'] - s['statuses'].get('ok', 0) - s['statuses'].get('not_modified', 0) - truncated
+            print(f"{system}: {s['boards']} boards ({failed} failed, {truncated} truncated, "
+                  f"{s['retries']} retries, {s['throttled']} throttled), "
+                  f"kept {s['kept']} / {s['kept'] + s['discarded']} postings, {s['seconds']:.1f}s")
+        if self.skipped:
+            print(f"{self.skipped} boards skipped at the deadline.")
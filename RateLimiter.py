@@ -0,0 +1,115 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# Starting request rate (requests/second) per ATS host.
+HOST_RATES = {
+    'boards-api.greenhouse.io': 20.0,
+    'api.lever.co': 10.0,
+    'apply.workable.com': 5.0,
+}
+DEFAULT_RATE = 10.0
+
+# AIMD tuning: the rate grows by RATE_INCREASE per second of successful
+# traffic and is multiplied by RATE_DECREASE on every 429 / 5xx.
+RATE_INCREASE = 0.5
+RATE_DECREASE = 0.5
+MIN_RATE = 0.5
+MAX_RATE_FACTOR = 4.0   # never exceed 4x the configured starting rate
+
+THROTTLE_STATUSES = {429, 500, 502, 503, 504}
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """Thread-safe token bucket whose rate adapts to throttling (AIMD)."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.max_rate = rate * MAX_RATE_FACTOR
+        self.capacity = burst or max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, timeout=None):
+        """Blocks until a request may be sent. Returns False if that would take
+        longer than `timeout` seconds."""
+        until = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                else:
+                    wait = (1 - self.tokens) / self.rate
+            if until is not None and now + wait > until:
+                return False
+            time.sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.rate + RATE_INCREASE / max(self.rate, 1.0), self.max_rate)
+
+    def on_throttle(self, retry_after=None):
+        with self._lock:
+            self.rate = max(self.rate * RATE_DECREASE, MIN_RATE)
+            self.tokens = 0.0
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+
+class HostRateLimiter:
+    """One adaptive token bucket per host, shared by all scraper threads."""
+
+    def __init__(self, rates=None, default_rate=DEFAULT_RATE):
+        self.rates = {**HOST_RATES, **(rates or {})}
+        self.default_rate = default_rate
+        self.buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url):
+        host = urlparse(url).hostname
+        with self._lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(self.rates.get(host, self.default_rate))
+            return self.buckets[host]
+
+    def acquire(self, url, timeout=None):
+        return self.bucket(url).acquire(timeout)
+
+    def observe(self, url, response, retried_statuses=()):
+        """Adapts the host's rate to a response and any statuses urllib3 retried.
+
+        Returns the Retry-After delay (seconds) if the response was throttled.
+        """
+        bucket = self.bucket(url)
+        for status in retried_statuses:
+            if status in THROTTLE_STATUSES:
+                bucket.on_throttle()
+        if response.status_code in THROTTLE_STATUSES:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            bucket.on_throttle(retry_after)
+            return retry_after or 0.0
+        bucket.on_success()
+        return None
@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+CACHE_DIR = '.http_cache'
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Bumped whenever the shape of cached pages changes, invalidating old entries.
+CACHE_FORMAT = 3
+
+class ResponseCache:
+    """On-disk cache of board responses, keyed by board URL.
+
+    An entry stores the server's ETag / Last-Modified validators together
+    with the page parsed from that response (its jobs and pagination
+    cursor), so a 304 reply can reuse it without downloading or parsing the
+    body again. Entries are evicted
+    least-recently-used first once the directory exceeds max_bytes.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = None
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode()).hexdigest() + '.json')
+
+    def get(self, url):
+        path = self._path(url)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('url') != url or entry.get('format') != CACHE_FORMAT:
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return entry
+
+    @staticmethod
+    def validators(entry):
+        """Conditional request headers for a cached entry."""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(self, url, response, page):
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+
+        body = json.dumps({
+            'url': url,
+            'format': CACHE_FORMAT,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': time.time(),
+            'page': page,
+        })
+        path = self._path(url)
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            self._scan()
+            try:
+                self._total_bytes -= os.path.getsize(path)
+            except OSError:
+                pass
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, 'w') as f:
+                f.write(body)
+            os.replace(tmp, path)
+            self._total_bytes += len(body)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _scan(self):
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, size, _ in self._entries())
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'): continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, st.st_size, st.st_mtime))
+        return entries
+
+    def _evict(self):
+        # Drop oldest entries until we are back under 90% of the budget,
+        # so a full cache doesn't rescan the directory on every write.
+        target = self.max_bytes * 0.9
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        self._total_bytes = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if self._total_bytes <= target: break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._total_bytes -= size
+
+    def clear(self):
+        with self._lock:
+            if os.path.isdir(self.directory):
+                for path, _, _ in self._entries():
+                    os.remove(path)
+            self._total_bytes = 0
@@ -0,0 +1,85 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+SCHEDULE_PATH = 'schedule.json'
+
+MIN_INTERVAL = 60 * 60            # floor for boards that change every run
+MAX_INTERVAL = 7 * 24 * 60 * 60   # ceiling for boards that never change
+BACKOFF = 2.0                     # interval multiplier after an unchanged fetch
+DUE_SLACK = 15 * 60               # boards due this close to a run are fetched early
+
+class BoardScheduler:
+    """Adaptive refresh schedule for ATS boards, persisted to schedule.json.
+
+    Every fetch is fingerprinted. A board whose postings changed drops back to
+    MIN_INTERVAL; an unchanged board backs off by BACKOFF up to MAX_INTERVAL.
+    Boards never seen before are always due.
+    """
+
+    def __init__(self, path=SCHEDULE_PATH, min_interval=MIN_INTERVAL,
+                 max_interval=MAX_INTERVAL, backoff=BACKOFF):
+        self.path = path
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self._lock = threading.Lock()
+        self.boards = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self.boards = json.load(f)
+            except ValueError:
+                self.boards = {}
+
+    @staticmethod
+    def key(system, company):
+        return f"{system}/{company}"
+
+    @staticmethod
+    def fingerprint(jobs):
+        urls = sorted(job['url'] for job in jobs)
+        return hashlib.sha1("\n".join(urls).encode()).hexdigest()
+
+    def is_due(self, system, company, now=None):
+        state = self.boards.get(self.key(system, company))
+        return state is None or state['next_due'] - DUE_SLACK <= (now or time.time())
+
+    def due_companies(self, companies, now=None):
+        """Filters a companies.json mapping down to the boards that are due."""
+        now = now or time.time()
+        return {
+            system: [c for c in boards if self.is_due(system, c, now)]
+            for system, boards in companies.items()
+        }
+
+    def record(self, system, company, jobs, now=None):
+        """Records a fetch and reschedules the board. Returns True if it changed."""
+        now = now or time.time()
+        fingerprint = self.fingerprint(jobs)
+        with self._lock:
+            state = self.boards.setdefault(self.key(system, company), {
+                'interval': self.min_interval, 'fingerprint': None,
+                'checks': 0, 'changes': 0, 'last_changed': None,
+            })
+            changed = state['fingerprint'] != fingerprint
+            if changed:
+                state['interval'] = self.min_interval
+                state['changes'] += 1
+                state['last_changed'] = now
+            else:
+                state['interval'] = min(state['interval'] * self.backoff, self.max_interval)
+            state['fingerprint'] = fingerprint
+            state['checks'] += 1
+            state['last_checked'] = now
+            state['next_due'] = now + state['interval']
+        return changed
+
+    def save(self):
+        with self._lock:
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w') as f:
+                json.dump(self.boards, f)
+            os.replace(tmp, self.path)
@@ -1,16 +1,120 @@
 import requests
+import asyncio
+import csv
 from datetime import datetime
+import html
 import json
 import os
-import pandas as pd
+import queue
 import re
+import threading
+import time
 
 from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Optional, TypedDict
 from requests.adapters import HTTPAdapter, Retry
+from urllib.parse import urlencode
+
+from Decoding import decode
+from HiddenJobs import HiddenJobs
+from JobStore import STORE_PATH
+from Metrics import RUN_REPORT_PATH, STAGES, RunMetrics, current_board
+from RateLimiter import HostRateLimiter
+from ResponseCache import ResponseCache
+from Scheduler import BoardScheduler
+
+# ATS API roots; overridden by Benchmark.py to point at its mock server.
+GREENHOUSE_API = "https://boards-api.greenhouse.io/v1/boards"
+LEVER_API = "https://api.lever.co/v0/postings"
+WORKABLE_API = "https://apply.workable.com/api/v3/accounts"
+
+# Max in-flight requests per ATS host. Overridable per run.
+HOST_CONCURRENCY = {
+    'Greenhouse': 16,   # boards-api.greenhouse.io
+    'Lever': 16,        # api.lever.co
+    'Workable': 8,      # apply.workable.com
+}
+DEFAULT_HOST_CONCURRENCY = 8   # for adapters not listed above
+
+# Wall-clock budget (seconds) for a whole scrape run; None disables it.
+RUN_DEADLINE = 600
+
+# Streaming pipeline: boards buffered between scraper and writer, and rows
+# per write batch.
+STREAM_MAX_PENDING = 32
+STREAM_BATCH_SIZE = 500
+
+# Optional Prometheus textfile written after each run (e.g. for node_exporter).
+METRICS_PATH = None
+
+# Greenhouse listings are fetched without descriptions; set this to pull the
+# description of each relevant posting in a second pass.
+GREENHOUSE_DESCRIPTIONS = False
+
+# Pagination: at most MAX_PAGES pages per board. Offset-paginated APIs
+# (Lever) request PAGE_CONCURRENCY pages at a time on a shared pool of
+# PAGE_WORKERS threads; cursor-paginated ones (Workable) go page by page.
+MAX_PAGES = 50
+PAGE_CONCURRENCY = 4
+PAGE_WORKERS = 16
+LEVER_PAGE_SIZE = 100
+
+# 429s are retried by throttled_get (so the host limiter can back off) up to
+# this many times per request.
+MAX_THROTTLE_RETRIES = 3
+
+class ServerErrorRetry(Retry):
+    """urllib3 retries for connection errors and 5xx.
+
+    429s are left to throttled_get, so Retry-After pauses every thread using
+    the host instead of only the one that got throttled.
+    """
+    RETRY_AFTER_STATUS_CODES = frozenset({503})
 
 session = requests.Session()
-retries = Retry(total=3, backoff_factor=0.3)
-session.mount("https://", HTTPAdapter(max_retries=retries))
+retries = ServerErrorRetry(total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504],
+                           raise_on_status=False)
+
+def configure_session(limits=HOST_CONCURRENCY):
+    """Mounts the shared adapter with a connection pool sized to the per-host concurrency
+    (plus the page workers)."""
+    adapter = HTTPAdapter(max_retries=retries, pool_connections=len(limits),
+                          pool_maxsize=max(limits.values()) + PAGE_WORKERS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+configure_session()
+
+# Adaptive per-host token buckets (see RateLimiter.py).
+rate_limiter = HostRateLimiter()
+
+# Conditional-request cache for board endpoints (see ResponseCache.py).
+response_cache = ResponseCache()
+
+# Shared pool for concurrent page fetches within a board.
+page_executor = ThreadPoolExecutor(max_workers=PAGE_WORKERS, thread_name_prefix='page')
+
+# Per-ATS request slots, sized like HOST_CONCURRENCY. Every board, page and
+# description request holds one while in flight, so page fetches on
+# page_executor count against the host's limit too.
+request_slots = {}
+_slots_lock = threading.Lock()
+
+@contextmanager
+def request_slot(system, metrics=None):
+    """Holds one of `system`'s request slots; the time spent waiting for it
+    is added to metrics['wait']."""
+    with _slots_lock:
+        if system not in request_slots:
+            limit = HOST_CONCURRENCY.get(system, DEFAULT_HOST_CONCURRENCY)
+            request_slots[system] = threading.BoundedSemaphore(limit)
+        slot = request_slots[system]
+    start = time.perf_counter()
+    with slot:
+        if metrics is not None: metrics['wait'] += time.perf_counter() - start
+        yield
 
 # ==========================================
 # 1. KEYWORDS & FILTERS
@@ -29,7 +133,7 @@ SENIOR_KEYWORDS = [
 JUNIOR_KEYWORDS = [
     r"\bjunior\b", r"\bjr\b", r"\bjr\.\b", r"entry[- ]?level", r"\bassociate\b",
     r"new[- ]?grad", r"early[- ]?career", r"graduate\b", r"grad\b",
-    r"\b(i|1)\b", r"level 1\b", r"level i\b",
+    r"\b(?:i|1)\b", r"level 1\b", r"level i\b",
     r"0-1", r"0-2", r"1-2", r"1-3",
     r"apprentice", r"fellowship", r"rotation", r"trainee",
     r"\bintern\b", r"internship", r"co-op\b", r"coop\b",
@@ -64,21 +168,79 @@ ROLE_KEYWORDS = [
 # 2. HELPER FUNCTIONS
 # ==========================================
 
-def contains_keywords(text, patterns):
-    return any(re.search(pattern, text) for pattern in patterns)
+def compile_keywords(patterns, literal=False):
+    """Merges a keyword family into a single alternation regex."""
+    if literal:
+        patterns = [re.escape(p) for p in patterns]
+    return re.compile("|".join(f"(?:{p})" for p in patterns))
+
+class TitleClassifier:
+    """Precompiled level / relevance / remote classifier.
+
+    Each keyword family is merged into one regex, so a title is scanned once
+    per family instead of once per pattern. Precedence matches the original
+    rules: Senior beats Junior beats Mid-Level, otherwise Standard (Mid).
+    """
+
+    def __init__(self):
+        self.senior_re = compile_keywords(SENIOR_KEYWORDS)
+        self.junior_re = compile_keywords(JUNIOR_KEYWORDS)
+        self.mid_re = compile_keywords(MID_LEVEL_KEYWORDS)
+        self.role_re = compile_keywords(ROLE_KEYWORDS, literal=True)
+        self.remote_re = compile_keywords(REMOTE_WORDS, literal=True)
+
+    def level(self, title_lower):
+        if self.senior_re.search(title_lower):
+            return "Senior"
+        elif self.junior_re.search(title_lower):
+            return "Junior"
+        elif self.mid_re.search(title_lower):
+            return "Mid-Level"
+        else:
+            return "Standard (Mid)"
+
+    def is_relevant(self, title_lower):
+        return self.role_re.search(title_lower) is not None
+
+    def is_remote(self, title_lower, location_lower=""):
+        return self.remote_re.search(location_lower) is not None or "remote" in title_lower
+
+    def classify(self, title, location=None):
+        """Returns (level, is_relevant, is_remote) for one posting."""
+        tl = title.lower()
+        ll = location.lower() if location else ""
+        return self.level(tl), self.is_relevant(tl), self.is_remote(tl, ll)
+
+    def classify_series(self, titles, locations=None):
+        """Classifies a pandas Series of titles (and optional locations) at once."""
+        import pandas as pd
+
+        tl = titles.fillna("").astype(str).str.lower()
+        senior = tl.str.contains(self.senior_re)
+        junior = tl.str.contains(self.junior_re)
+        mid = tl.str.contains(self.mid_re)
+
+        level = pd.Series("Standard (Mid)", index=tl.index, dtype=object)
+        level = level.mask(mid, "Mid-Level").mask(junior, "Junior").mask(senior, "Senior")
+
+        is_remote = tl.str.contains("remote", regex=False)
+        if locations is not None:
+            ll = locations.fillna("").astype(str).str.lower()
+            is_remote |= ll.str.contains(self.remote_re)
+
+        return pd.DataFrame({
+            'level': level,
+            'is_relevant': tl.str.contains(self.role_re),
+            'is_remote': is_remote,
+        })
+
+classifier = TitleClassifier()
 
 def is_relevant_role(title_lower):
-    return any(keyword in title_lower for keyword in ROLE_KEYWORDS)
+    return classifier.is_relevant(title_lower)
 
 def determine_level(title_lower):
-    if contains_keywords(title_lower, SENIOR_KEYWORDS):
-        return "Senior"
-    elif contains_keywords(title_lower, JUNIOR_KEYWORDS):
-        return "Junior"
-    elif contains_keywords(title_lower, MID_LEVEL_KEYWORDS):
-        return "Mid-Level"
-    else:
-        return "Standard (Mid)"
+    return classifier.level(title_lower)
 
 def load_companies():
     if os.path.exists('companies.json'):
@@ -87,156 +249,764 @@ def load_companies():
     else:
         return {}
 
-def load_hidden_jobs():
-    """Loads the list of URLs the user has hidden via the dashboard."""
-    if os.path.exists('hidden_jobs.json'):
-        try:
-            with open('hidden_jobs.json', 'r') as f:
-                return set(json.load(f))
-        except:
-            return set()
-    return set()
-
-def process_job(title, location, url, company, source, date_posted=None):
-    tl = title.lower()
-    ll = location.lower() if location else ""
-    
-    level = determine_level(tl)
-    is_remote = any(word in ll for word in REMOTE_WORDS) or "remote" in tl
+RECORD_FIELDS = ['title', 'company', 'location', 'url', 'source', 'board',
+                 'level', 'is_remote', 'posted_date', 'scraped_at']
 
+def raw_job(title, location, url, company, source, posted_raw=None, board=None):
+    """A scraped posting before classification; see normalize_jobs.
+
+    `posted_raw` is whatever the ATS returned: an ISO string for Greenhouse
+    and Workable, epoch milliseconds for Lever. `board` is the companies.json
+    slug the posting was listed under.
+    """
     return {
         'title': title,
         'company': company,
         'location': location,
         'url': url,
         'source': source,
-        'level': level,
-        'is_remote': is_remote,
-        'posted_date': date_posted,
-        'scraped_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        'board': board,
+        'posted_raw': posted_raw,
     }
 
+def normalize_posted_dates(df):
+    """YYYY-MM-DD posted dates from each source's raw value, column-wise."""
+    import pandas as pd
+    from dateutil.tz import tzlocal
+
+    raw = df['posted_raw']
+    posted = pd.Series(None, index=df.index, dtype=object)
+    lever = (df['source'] == 'Lever').to_numpy()
+    if lever.any():
+        millis = pd.to_numeric(raw[lever], errors='coerce')
+        local = pd.to_datetime(millis, unit='ms', utc=True).dt.tz_convert(tzlocal())
+        posted[lever] = local.dt.strftime('%Y-%m-%d')
+    other = ~lever & raw.notna().to_numpy()
+    if other.any():
+        posted[other] = raw[other].astype(str).str.split('T').str[0]
+    return posted.where(posted.notna(), None)
+
+def normalize_jobs(df, scraped_at=None):
+    """Classifies, dates and dedupes a frame of raw jobs in batched column operations."""
+    df = df.drop_duplicates(subset=['title', 'company', 'location'])
+    labels = classifier.classify_series(df['title'], df['location'])
+    df = df.assign(
+        level=labels['level'],
+        is_remote=labels['is_remote'],
+        posted_date=normalize_posted_dates(df),
+        scraped_at=scraped_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    )
+    extra = [c for c in df.columns if c not in RECORD_FIELDS and c != 'posted_raw']
+    return df[RECORD_FIELDS + extra]
+
 # ==========================================
 # 3. API SCRAPERS
 # ==========================================
 
-def scrape_greenhouse_api(company_name):
-    url = f"https://boards-api.greenhouse.io/v1/boards/{company_name}/jobs"
+def count_postings(data):
+    return len(data) if isinstance(data, list) else len(data.get('jobs', []))
+
+def retry_history(response):
+    """Statuses of the attempts urllib3 retried before this response (None for errors)."""
+    retries = getattr(response.raw, 'retries', None)
+    return [h.status for h in retries.history] if retries is not None else []
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """The run deadline passed before a request could be sent."""
+
+# time.monotonic() at which the running scrape's deadline expires, set by
+# scrape_all_companies_async (None: no deadline). Requests are refused past
+# it, so boards still in flight stop at their next page instead of running on.
+run_deadline = None
+
+def time_left():
+    """Seconds until run_deadline (None without one); raises DeadlineExceeded once it has passed."""
+    if run_deadline is None:
+        return None
+    left = run_deadline - time.monotonic()
+    if left <= 0:
+        raise DeadlineExceeded("run deadline reached")
+    return left
+
+def throttled_get(url, metrics=None, **kwargs):
+    """session.get behind the host rate limiter, retrying 429s after Retry-After.
+
+    Retries are counted on `metrics`, or on the current board's metrics,
+    along with the time spent in the limiter ('wait', which includes any
+    Retry-After) and in session.get up to the response headers ('ttfb').
+    Past run_deadline it raises DeadlineExceeded instead of sending, and the
+    request timeout is capped at the time left.
+    """
+    m = metrics if metrics is not None else current_board()
+    for attempt in range(MAX_THROTTLE_RETRIES + 1):
+        start = time.perf_counter()
+        if not rate_limiter.acquire(url, time_left()):
+            raise DeadlineExceeded("run deadline reached waiting for the rate limiter")
+        sent = time.perf_counter()
+        left = time_left()
+        if left is not None:
+            kwargs['timeout'] = min(kwargs.get('timeout') or left, left)
+        response = session.get(url, **kwargs)
+        if m is not None:
+            m['wait'] += sent - start
+            m['ttfb'] += time.perf_counter() - sent
+        history = retry_history(response)
+        if m is not None: m['retries'] += len(history)
+        rate_limiter.observe(url, response, history)
+        if response.status_code != 429 or attempt == MAX_THROTTLE_RETRIES:
+            return response
+        # The limiter now blocks this host until Retry-After has passed.
+        if m is not None: m['throttled'] += 1
+        response.close()
+
+def page_stats():
+    """Per-page metrics, merged into the board's by merge_page_stats."""
+    return {'status': 'ok', 'http_status': None, 'error': None, 'retries': 0,
+            'throttled': 0, 'bytes': 0, 'count': 0, **{stage: 0.0 for stage in STAGES}}
+
+def merge_page_stats(m, pages):
+    """Folds page metrics into a board's: summed timings/counters, worst outcome."""
+    for key in ('retries', 'throttled', 'bytes') + STAGES:
+        m[key] = m.get(key, 0) + sum(p[key] for p in pages)
+    failed = [p for p in pages if p['status'] not in ('ok', 'not_modified')]
+    last = failed[0] if failed else pages[-1]
+    m['http_status'], m['error'] = last['http_status'], last['error']
+    if failed:
+        m['status'] = last['status']
+    elif all(p['status'] == 'not_modified' for p in pages):
+        m['status'] = 'not_modified'
+
+def fetch_page(adapter, company, request, stats):
+    """GETs one page of a board, reusing the cached page when the server answers 304.
+
+    Returns {'jobs', 'count', 'next'} (parsed records, postings on the page
+    and the cursor request for the following page) or None on failure.
+    `adapter.variant` distinguishes cache entries whose parsed jobs differ
+    for the same URL (e.g. with or without descriptions).
+    """
+    url, params = request
+    cache_key = f"{url}?{urlencode(params)}" if params else url
+    if adapter.variant: cache_key += f"#{adapter.variant}"
+    cached = response_cache.get(cache_key)
     try:
-        response = session.get(url, timeout=10, params={'content': 'true'})
-        if response.status_code != 200: return []
-        data = response.json()
-    except: return []
-    
-    jobs = []
-    for job in data.get('jobs', []):
-        title = job.get('title', '')
-        if not is_relevant_role(title.lower()): continue
-        
-        posted_date = None
-        if 'updated_at' in job:
-            posted_date = job['updated_at'].split('T')[0]
-
-        jobs.append(process_job(
-            title, job.get('location', {}).get('name', ''), 
-            job.get('absolute_url', ''), job.get('company_name', company_name), 
-            'Greenhouse', posted_date
-        ))
+        with request_slot(adapter.source, stats), \
+                throttled_get(url, stats, timeout=10, params=params, stream=True,
+                              headers=ResponseCache.validators(cached)) as response:
+            stats['http_status'] = response.status_code
+            if response.status_code != 200:
+                response.content  # read the (empty) body so the connection goes back to the pool
+            if response.status_code == 304 and cached is not None:
+                stats['status'] = 'not_modified'
+                page = cached['page']
+                stats['count'] = page['count']
+                return page
+            if response.status_code != 200:
+                stats['status'] = 'http_error'
+                return None
+
+            start = time.perf_counter()
+            stats['bytes'] = len(response.content)
+            stats['download'] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            data = decode(response.content, adapter.schema)
+            stats['json_parse'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        page = {'jobs': list(adapter.parse(data, company)), 'count': adapter.count(data),
+                'next': adapter.next_request(data, company, request)}
+        stats['parse'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        adapter.describe(page['jobs'], data, company)
+        stats['descriptions'] = time.perf_counter() - start
+    except Exception as e:
+        stats['status'] = 'error'
+        stats['error'] = f"{type(e).__name__}: {e}"
+        if isinstance(e, (requests.exceptions.RetryError, requests.exceptions.ConnectionError)):
+            stats['retries'] = retries.total  # urllib3 gave up after exhausting its retries
+        return None
+
+    stats['count'] = page['count']
+    response_cache.put(cache_key, response, page)
+    return page
+
+def fetch_board(adapter, company):
+    """Fetches every page of a board through `adapter`. Returns its job records.
+
+    Offset-paginated adapters have their next PAGE_CONCURRENCY pages
+    requested at once, until a short or failed page; cursor-paginated ones
+    follow `next` one page at a time. If any page fails the board returns no
+    jobs, so a partial listing never closes the postings it missed. A board
+    with more than MAX_PAGES pages keeps the jobs it got but is marked
+    'truncated', which likewise keeps it out of closing. Stage timings and
+    the outcome are recorded on the current board's metrics.
+    """
+    m = current_board() or {}
+    stats = [page_stats()]
+    pages = [fetch_page(adapter, company, adapter.first_request(company), stats[0])]
+
+    def full(page):
+        return page is not None and page['count'] >= adapter.page_size
+
+    if adapter.page_size:
+        while full(pages[-1]) and len(pages) < MAX_PAGES:
+            numbers = range(len(pages), min(len(pages) + PAGE_CONCURRENCY, MAX_PAGES))
+            batch = [(adapter.page_request(company, n), page_stats()) for n in numbers]
+            results = list(page_executor.map(lambda r: fetch_page(adapter, company, *r), batch))
+            for page, (_, page_stat) in zip(results, batch):
+                pages.append(page)
+                stats.append(page_stat)
+                if not full(page): break
+    else:
+        while pages[-1] is not None and pages[-1]['next'] and len(pages) < MAX_PAGES:
+            stats.append(page_stats())
+            pages.append(fetch_page(adapter, company, pages[-1]['next'], stats[-1]))
+
+    merge_page_stats(m, stats)
+    if any(page is None for page in pages):
+        return []
+    if full(pages[-1]) if adapter.page_size else pages[-1]['next']:
+        m['status'] = 'truncated'
+        print(f"{adapter.source} board {company} has more than {MAX_PAGES} pages; keeping its unseen postings open.")
+    jobs = [job for page in pages for job in page['jobs']]
+    m['kept'] = len(jobs)
+    m['discarded'] = sum(page['count'] for page in pages) - len(jobs)
     return jobs
 
-def scrape_lever_api(company_name):
-    url = f"https://api.lever.co/v0/postings/{company_name}"
+def fetch_greenhouse_description(company_name, job_id, stats):
+    """Fetches the HTML description of a single Greenhouse posting, or None on failure."""
+    url = f"{GREENHOUSE_API}/{company_name}/jobs/{job_id}"
     try:
-        response = session.get(url, timeout=10, params={'mode': 'json'})
-        if response.status_code != 200: return []
-        data = response.json()
-    except: return []
-    
-    jobs = []
+        with request_slot('Greenhouse'), throttled_get(url, stats, timeout=10) as response:
+            if response.status_code != 200: return None
+            return html.unescape(decode(response.content, GreenhouseJobContent).get('content') or '')
+    except (requests.RequestException, ValueError):
+        return None
+
+def fetch_greenhouse_descriptions(company_name, job_ids):
+    """Descriptions of several postings, fetched concurrently on page_executor.
+
+    Retries and failed fetches are counted on the current board's metrics.
+    """
+    stats = [page_stats() for _ in job_ids]
+    descriptions = list(page_executor.map(
+        lambda job_id, s: fetch_greenhouse_description(company_name, job_id, s), job_ids, stats))
+    m = current_board()
+    if m is not None:
+        m['retries'] += sum(s['retries'] for s in stats)
+        m['throttled'] += sum(s['throttled'] for s in stats)
+        m['description_errors'] += descriptions.count(None)
+    return descriptions
+
+def relevant_greenhouse_jobs(data):
+    return [job for job in data.get('jobs', []) if is_relevant_role((job.get('title') or '').lower())]
+
+def parse_greenhouse_jobs(data, company_name):
+    return [raw_job(
+        job.get('title') or '', (job.get('location') or {}).get('name') or '', 
+        job.get('absolute_url') or '', job.get('company_name') or company_name, 
+        'Greenhouse', job.get('updated_at'), company_name
+    ) for job in relevant_greenhouse_jobs(data)]
+
+def add_greenhouse_descriptions(records, data, company_name):
+    """Fills in the description of each record parsed from `data`."""
+    described = [(record, job['id']) for record, job in zip(records, relevant_greenhouse_jobs(data)) if 'id' in job]
+    descriptions = fetch_greenhouse_descriptions(company_name, [job_id for _, job_id in described])
+    for (record, _), description in zip(described, descriptions):
+        record['description'] = description
+
+def parse_lever_jobs(data, company_name):
     for job in data:
-        title = job.get('text', '')
+        title = job.get('text') or ''
         if not is_relevant_role(title.lower()): continue
         
-        posted_date = None
-        if 'createdAt' in job:
-            posted_date = datetime.fromtimestamp(job['createdAt'] / 1000).strftime('%Y-%m-%d')
-
-        jobs.append(process_job(
-            title, job.get('categories', {}).get('location', ''), 
-            job.get('hostedUrl', ''), job.get('company', {}).get('name', company_name), 
-            'Lever', posted_date
-        ))
-    return jobs
+        yield raw_job(
+            title, (job.get('categories') or {}).get('location') or '', 
+            job.get('hostedUrl') or '', (job.get('company') or {}).get('name') or company_name, 
+            'Lever', job.get('createdAt'), company_name
+        )
 
-def scrape_workable_api(company_name):
-    url = f"https://apply.workable.com/api/v3/accounts/{company_name}/jobs"
-    try:
-        response = session.get(url, timeout=10)
-        if response.status_code != 200: return []
-        data = response.json()
-    except: return []
-    
-    jobs = []
+def parse_workable_jobs(data, company_name):
     for job in data.get('jobs', []):
-        title = job.get('title', '')
+        title = job.get('title') or ''
         if not is_relevant_role(title.lower()): continue
         
-        posted_date = None
-        if 'published_on' in job:
-            posted_date = job['published_on'].split('T')[0]
-
-        jobs.append(process_job(
-            title, job.get('location', {}).get('country', ''), 
-            job.get('url', ''), company_name.capitalize(), 
-            'Workable', posted_date
-        ))
-    return jobs
+        yield raw_job(
+            title, (job.get('location') or {}).get('country') or '', 
+            job.get('url') or '', company_name.capitalize(), 
+            'Workable', job.get('published_on'), company_name
+        )
 
-def scrape_all_companies():
-    companies = load_companies()
-    all_jobs = []
-    
-    with ThreadPoolExecutor(max_workers=8) as executor:
-        for system, func in [('Greenhouse', scrape_greenhouse_api), 
-                             ('Lever', scrape_lever_api), 
-                             ('Workable', scrape_workable_api)]:
-            if system in companies:
-                print(f"Scraping {system}...")
-                results = executor.map(func, companies[system])
-                for res in results: all_jobs.extend(res)
+# ==========================================
+# ATS ADAPTERS
+# ==========================================
+
+# Payload schemas: only the fields the parsers read. With msgspec installed
+# pages are decoded straight into these (see Decoding.py).
+
+class GreenhouseLocation(TypedDict, total=False):
+    name: Any
+
+class GreenhouseJob(TypedDict, total=False):
+    id: Any
+    title: Any
+    location: Optional[GreenhouseLocation]
+    absolute_url: Any
+    company_name: Any
+    updated_at: Any
+
+class GreenhouseBoard(TypedDict, total=False):
+    jobs: list[GreenhouseJob]
+
+class GreenhouseJobContent(TypedDict, total=False):
+    content: Any
+
+class LeverCategories(TypedDict, total=False):
+    location: Any
+
+class LeverCompany(TypedDict, total=False):
+    name: Any
 
+class LeverJob(TypedDict, total=False):
+    text: Any
+    categories: Optional[LeverCategories]
+    hostedUrl: Any
+    company: Optional[LeverCompany]
+    createdAt: Any
+
+class WorkableLocation(TypedDict, total=False):
+    country: Any
+
+class WorkableJob(TypedDict, total=False):
+    title: Any
+    location: Optional[WorkableLocation]
+    url: Any
+    published_on: Any
+
+class WorkableBoard(TypedDict, total=False):
+    jobs: list[WorkableJob]
+    nextPage: Any
+
+class AtsAdapter:
+    """Fetch / parse / paginate hooks for one applicant tracking system.
+
+    `fetch` scrapes a whole board and by default drives the other hooks via
+    fetch_board. Offset-paginated APIs set `page_size` and build page n's
+    request in `page_request`; cursor-paginated APIs return the following
+    request from `next_request`. Requests are (url, params) pairs. `schema`
+    lists the payload fields `parse` needs, so the rest can be skipped
+    while decoding.
+    """
+    source = None
+    schema = None
+    page_size = None
+    variant = None
+
+    def fetch(self, company):
+        return fetch_board(self, company)
+
+    def first_request(self, company):
+        return self.page_request(company, 0)
+
+    def page_request(self, company, page):
+        raise NotImplementedError
+
+    def parse(self, data, company):
+        raise NotImplementedError
+
+    def describe(self, jobs, data, company):
+        """Adds details fetched per posting to the jobs parsed from `data`."""
+
+    def count(self, data):
+        return count_postings(data)
+
+    def next_request(self, data, company, request):
+        return None
+
+# companies.json key -> adapter instance
+ATS_ADAPTERS = {}
+
+def register_adapter(cls):
+    """Class decorator adding an adapter to ATS_ADAPTERS under its `source` name."""
+    ATS_ADAPTERS[cls.source] = cls()
+    return cls
+
+@register_adapter
+class GreenhouseAdapter(AtsAdapter):
+    """One unpaginated listing per board; descriptions optionally fetched per posting."""
+    source = 'Greenhouse'
+    schema = GreenhouseBoard
+
+    def __init__(self, with_descriptions=None):
+        self.with_descriptions = with_descriptions
+
+    @property
+    def descriptions(self):
+        return GREENHOUSE_DESCRIPTIONS if self.with_descriptions is None else self.with_descriptions
+
+    @property
+    def variant(self):
+        return 'descriptions' if self.descriptions else None
+
+    def page_request(self, company, page):
+        return f"{GREENHOUSE_API}/{company}/jobs", None
+
+    def parse(self, data, company):
+        return parse_greenhouse_jobs(data, company)
+
+    def describe(self, jobs, data, company):
+        if self.descriptions:
+            add_greenhouse_descriptions(jobs, data, company)
+
+@register_adapter
+class LeverAdapter(AtsAdapter):
+    """skip/limit pagination, so pages can be requested concurrently."""
+    source = 'Lever'
+    schema = list[LeverJob]
+    page_size = LEVER_PAGE_SIZE
+
+    def page_request(self, company, page):
+        return f"{LEVER_API}/{company}", {'mode': 'json', 'skip': page * self.page_size,
+                                          'limit': self.page_size}
+
+    def parse(self, data, company):
+        return parse_lever_jobs(data, company)
+
+@register_adapter
+class WorkableAdapter(AtsAdapter):
+    """Cursor pagination: each page carries the token of the next."""
+    source = 'Workable'
+    schema = WorkableBoard
+
+    def page_request(self, company, page):
+        return f"{WORKABLE_API}/{company}/jobs", None
+
+    def next_request(self, data, company, request):
+        token = data.get('nextPage')
+        return (request[0], {'token': token}) if token else None
+
+    def parse(self, data, company):
+        return parse_workable_jobs(data, company)
+
+# ==========================================
+# 4. SCRAPING ENGINE
+# ==========================================
+
+async def scrape_all_companies_async(host_limits=None, deadline=RUN_DEADLINE, on_board=None,
+                                     scheduler=None, metrics=None, companies=None):
+    """Scrapes every board of every ATS concurrently.
+
+    All systems share the module session (one connection pool). Each host is
+    capped by its own semaphore, both in boards at a time and in requests in
+    flight (see request_slot), and boards still pending when the deadline
+    expires are dropped from the run; their requests stop there too (see
+    run_deadline). If `on_board` is given, each board's
+    jobs are handed to it from the worker thread instead of being collected,
+    as on_board((system, company), jobs), with None in place of the board
+    if its fetch failed.
+    With a `scheduler`, only boards that are due are fetched, and each
+    successful fetch is recorded so the board's refresh interval adapts.
+    Per-board timings and outcomes go to `metrics` (a RunMetrics), if given.
+    `companies` defaults to companies.json.
+    """
+    if companies is None:
+        companies = load_companies()
+    if scheduler is not None:
+        companies = scheduler.due_companies(companies)
+    limits = {**HOST_CONCURRENCY, **(host_limits or {})}
+    unknown = [s for s in companies if s not in ATS_ADAPTERS]
+    if unknown:
+        print(f"No ATS adapter for {', '.join(unknown)}; skipping those boards.")
+    systems = [s for s in ATS_ADAPTERS if companies.get(s)]
+    if not systems:
+        return []
+    if limits != HOST_CONCURRENCY:
+        configure_session(limits)
+
+    global run_deadline
+    run_deadline = None if deadline is None else time.monotonic() + deadline
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=sum(limits.get(s, DEFAULT_HOST_CONCURRENCY) for s in systems))
+    semaphores = {s: asyncio.Semaphore(limits.get(s, DEFAULT_HOST_CONCURRENCY)) for s in systems}
+    with _slots_lock:
+        request_slots.update({s: threading.BoundedSemaphore(limits.get(s, DEFAULT_HOST_CONCURRENCY))
+                              for s in systems})
+
+    def run(system, company):
+        with (metrics or RunMetrics()).board(system, company) as m:
+            jobs = ATS_ADAPTERS[system].fetch(company)
+        fetched = m['status'] in ('ok', 'not_modified')
+        if scheduler is not None and fetched:
+            scheduler.record(system, company, jobs)
+        if on_board is None: return jobs
+        on_board((system, company) if fetched else None, jobs)
+        return []
+
+    async def scrape(system, company):
+        async with semaphores[system]:
+            return await loop.run_in_executor(executor, run, system, company)
+
+    tasks = []
+    for system in systems:
+        print(f"Scraping {system} ({len(companies[system])} boards)...")
+        tasks.extend(asyncio.create_task(scrape(system, c)) for c in companies[system])
+
+    try:
+        done, pending = await asyncio.wait(tasks, timeout=deadline)
+        if pending:
+            print(f"Deadline reached, skipping {len(pending)} unfinished boards.")
+            for task in pending: task.cancel()
+            if metrics is not None: metrics.skipped = len(pending)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        if scheduler is not None: scheduler.save()
+        if metrics is not None: metrics.finish()
+
+    all_jobs = []
+    for task in tasks:
+        if task in done: all_jobs.extend(task.result())
     return all_jobs
 
-def save_to_csv(jobs):
+def scrape_all_companies(host_limits=None, deadline=RUN_DEADLINE, scheduler=None, metrics=None,
+                         companies=None):
+    return asyncio.run(scrape_all_companies_async(host_limits, deadline, scheduler=scheduler,
+                                                  metrics=metrics, companies=companies))
+
+def iter_all_companies(host_limits=None, deadline=RUN_DEADLINE, max_pending=STREAM_MAX_PENDING,
+                       scheduler=None, metrics=None, companies=None, fetched=None):
+    """Yields job records as boards finish, without collecting the whole run.
+
+    The engine runs in a background thread and hands each board's jobs over a
+    bounded queue, so at most `max_pending` boards are buffered at a time;
+    workers wait when the consumer falls behind. The (system, board) pairs
+    fetched successfully are added to the `fetched` set as their jobs are
+    consumed, so boards dropped at the deadline never make it in.
+    """
+    boards = queue.Queue(maxsize=max_pending)
+    stopped = threading.Event()
+    finished = object()
+    errors = []
+
+    def emit(*item):
+        while not stopped.is_set():
+            try:
+                boards.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                pass
+
+    def produce():
+        try:
+            asyncio.run(scrape_all_companies_async(host_limits, deadline, on_board=emit,
+                                                   scheduler=scheduler, metrics=metrics,
+                                                   companies=companies))
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            emit(finished, [])
+
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while (item := boards.get())[0] is not finished:
+            board, jobs = item
+            yield from jobs
+            if board is not None and fetched is not None:
+                fetched.add(board)
+    finally:
+        stopped.set()
+    if errors:
+        raise errors[0]
+
+def load_deduplicator(path=STORE_PATH):
+    """A Deduplicator primed with the store's postings, so job IDs carry over between runs."""
+    from Dedup import Deduplicator
+    from JobStore import JobStore
+
+    if not os.path.exists(path):
+        return Deduplicator()
+    with JobStore(path) as store:
+        return Deduplicator(store.dedup_candidates())
+
+def iter_batches(records, size):
+    records = iter(records)
+    while batch := list(islice(records, size)):
+        yield batch
+
+# ==========================================
+# 5. OUTPUT
+# ==========================================
+
+def prepare_jobs(jobs, store_path=STORE_PATH):
+    """Dedupes across sources, drops hidden postings and normalizes the rest (see normalize_jobs).
+
+    Job IDs carry over from the store at `store_path`. Returns a DataFrame,
+    or None if nothing is left.
+    """
+    import pandas as pd
+
     if not jobs: 
         print("No jobs found.")
         return None
     
     # --- FILTER HIDDEN JOBS ---
-    hidden_urls = load_hidden_jobs()
-    if hidden_urls:
-        print(f"Filtering out {len(hidden_urls)} hidden jobs...")
-        jobs = [j for j in jobs if j['url'] not in hidden_urls]
+    deduped = list(load_deduplicator(store_path).dedupe(jobs))
+    if len(deduped) < len(jobs):
+        print(f"Merged {len(jobs) - len(deduped)} duplicate postings...")
+    with HiddenJobs() as hidden:
+        df = hidden.drop(pd.DataFrame(deduped))
+    if len(df) < len(deduped):
+        print(f"Filtered out {len(deduped) - len(df)} hidden jobs...")
     
-    if not jobs:
+    if df.empty:
         print("All jobs were hidden or none found.")
         return None
     # --------------------------
 
-    df = pd.DataFrame(jobs)
-    df = df.drop_duplicates(subset=['title', 'company', 'location'])
+    return normalize_jobs(df)
+
+def save_to_csv(jobs):
+    df = prepare_jobs(jobs)
+    if df is None: return None
     filename = f"jobs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
     df.to_csv(filename, index=False)
     print(f"Saved {len(df)} jobs to {filename}")
     return df
 
-if __name__ == "__main__":
+def to_typed_frame(df):
+    """Casts a jobs frame to compact, typed columns for columnar snapshots."""
+    import pandas as pd
+
+    df = df.astype({'level': 'category', 'source': 'category',
+                    'company': 'category', 'is_remote': bool})
+    df['posted_date'] = pd.to_datetime(df['posted_date'], errors='coerce')
+    df['scraped_at'] = pd.to_datetime(df['scraped_at'], errors='coerce')
+    return df
+
+def write_parquet(df):
+    df = to_typed_frame(df)
+    filename = f"jobs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.parquet"
+    df.to_parquet(filename, index=False)
+    print(f"Saved {len(df)} jobs to {filename}")
+    return df
+
+class CsvSink:
+    """Appends normalized batches to a timestamped CSV as they arrive.
+
+    Job IDs are still taken from the store at `store_path`, so they match
+    the ones the store would assign. Hidden jobs are left out unless
+    `drop_hidden` is False (shard partials, which are merged into the store).
+    """
+
+    def __init__(self, filename=None, fieldnames=None, store_path=STORE_PATH, drop_hidden=True):
+        self.store_path = store_path
+        self.drop_hidden = drop_hidden
+        self.filename = filename or f"jobs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        self.fieldnames = fieldnames or RECORD_FIELDS + ['job_id'] + (['description'] if GREENHOUSE_DESCRIPTIONS else [])
+        self.boards = set()
+        self.file = open(self.filename, 'w', newline='')
+        csv.writer(self.file).writerow(self.fieldnames)
+
+    def write(self, frame):
+        frame.reindex(columns=self.fieldnames).to_csv(self.file, header=False, index=False)
+        self.file.flush()
+
+    def close(self, boards=()):
+        """Closes the file. `boards` (the ones fetched successfully) are kept in self.boards."""
+        self.boards = set(boards)
+        self.file.close()
+        return self.filename
+
+class StoreSink:
+    """Upserts normalized batches into the job store, closing vanished jobs and
+    refreshing today's rollups at the end.
+
+    Hidden jobs are stored like any other, so they stay open while listed and
+    come back when un-hidden; readers (the dashboard, exports) filter them.
+    """
+
+    drop_hidden = False
+
+    def __init__(self, path=STORE_PATH):
+        from JobStore import JobStore
+
+        self.store = JobStore(path)
+        self.filename = self.store_path = path
+        self.seen_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    def write(self, frame):
+        self.store.upsert(frame.to_dict('records'), self.seen_at)
+
+    def close(self, boards=()):
+        """Closes jobs of `boards` (the (system, board) pairs fetched successfully) that weren't written."""
+        closed = self.store.close_missing(boards, self.seen_at)
+        self.store.rollup(self.seen_at[:10])
+        self.store.close()
+        print(f"Closed {closed} jobs no longer listed.")
+        return self.filename
+
+def stream_jobs(sink, batch_size=STREAM_BATCH_SIZE, **engine_options):
+    """Scrapes all companies straight into `sink` in bounded batches. Returns the row count.
+
+    Each batch of raw records is normalized as one frame, with a single
+    run-level scraped_at. Near-duplicate postings are merged on the way in,
+    with job IDs from the sink's store (`sink.store_path`).
+    The sink is closed with the boards that were fetched successfully, or
+    with none if the run failed part way.
+    """
+    import pandas as pd
+
+    fetched, boards = set(), ()
+    records = load_deduplicator(sink.store_path).dedupe(iter_all_companies(fetched=fetched, **engine_options))
+    hidden_jobs = HiddenJobs() if sink.drop_hidden else None
+    scraped_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    count = hidden = 0
+    try:
+        for batch in iter_batches(records, batch_size):
+            frame = pd.DataFrame(batch)
+            if hidden_jobs is not None:
+                frame = hidden_jobs.drop(frame)
+                hidden += len(batch) - len(frame)
+            if frame.empty: continue
+            frame = normalize_jobs(frame, scraped_at)
+            sink.write(frame)
+            count += len(frame)
+        boards = fetched
+    finally:
+        if hidden_jobs is not None:
+            hidden_jobs.close()
+        filename = sink.close(boards)
+    if hidden:
+        print(f"Filtered out {hidden} hidden jobs...")
+    print(f"Saved {count} jobs to {filename}")
+    return count
+
+def main(sink=None, scheduled=True, metrics_path=METRICS_PATH, report_path=RUN_REPORT_PATH):
+    """One full scrape run into `sink` (default: the job store), with run reports.
+
+    A scheduled run with no boards due stops before pandas and the
+    deduplicator are loaded.
+    """
     print("=" * 60)
     print("JOB SCRAPER - Let's find a job")
     print("=" * 60)
     
-    jobs = scrape_all_companies()
-    if jobs:
-        save_to_csv(jobs)
-    else:
-        print("\nNo matching jobs found")
\ No newline at end of file
+    metrics = RunMetrics()
+    scheduler = BoardScheduler() if scheduled else None
+    companies = load_companies()
+    if scheduler is not None:
+        companies = scheduler.due_companies(companies)
+    if not any(companies.values()):
+        print("No boards due.")
+        metrics.finish()
+        if sink is not None: sink.close()
+    elif not stream_jobs(sink or StoreSink(), scheduler=scheduler, metrics=metrics, companies=companies):
+        print("\nNo matching jobs found")
+    metrics.print_summary()
+    metrics.write_report(report_path)
+    if metrics_path:
+        metrics.write_prometheus(metrics_path)
+    return metrics
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
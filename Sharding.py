@@ -0,0 +1,150 @@
+"""Sharded scraping: split companies.json across processes or machines.
+
+Boards are assigned to shards by consistent hashing on "<system>/<board>",
+so changing the shard count only moves a small share of boards (and their
+per-shard schedules and caches stay mostly warm). Each shard streams its
+results to a partial CSV in the shard directory, next to the list of boards
+it fetched; `merge` dedupes the partials into the job store, closing jobs of
+those boards that are gone, and optionally writes a snapshot too. Duplicates
+that landed in different shards are merged there.
+
+    python Sharding.py run --shard 3 --of 8      # one shard, e.g. per node
+    python Sharding.py merge                     # after all shards finished
+    python Sharding.py local --shards 4          # process pool on one box
+"""
+import argparse
+import bisect
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import Scraper
+from JobStore import JobStore, STORE_PATH
+from Metrics import RunMetrics
+from Scheduler import BoardScheduler
+
+SHARD_DIR = 'shards'
+VIRTUAL_NODES = 64   # ring points per shard; more points spread boards more evenly
+
+def _hash(key):
+    return int.from_bytes(hashlib.sha1(key.encode()).digest()[:8], 'big')
+
+class HashRing:
+    """Consistent-hash ring mapping board keys to shard numbers."""
+
+    def __init__(self, shards, virtual_nodes=VIRTUAL_NODES):
+        points = sorted((_hash(f"shard-{s}#{v}"), s)
+                        for s in range(shards) for v in range(virtual_nodes))
+        self.hashes = [h for h, _ in points]
+        self.shards = [s for _, s in points]
+
+    def shard_of(self, key):
+        i = bisect.bisect(self.hashes, _hash(key)) % len(self.hashes)
+        return self.shards[i]
+
+def split_companies(companies, shards):
+    """Splits a companies.json mapping into `shards` mappings of the same shape."""
+    ring = HashRing(shards)
+    parts = [{system: [] for system in companies} for _ in range(shards)]
+    for system, boards in companies.items():
+        for board in boards:
+            parts[ring.shard_of(f"{system}/{board}")][system].append(board)
+    return parts
+
+def shard_path(index, shards, directory=SHARD_DIR, suffix='csv'):
+    return os.path.join(directory, f"shard_{index:03d}_of_{shards:03d}.{suffix}")
+
+def run_shard(index, shards, directory=SHARD_DIR, schedule=False, descriptions=False):
+    """Scrapes one shard into its partial CSV. Returns the number of rows written."""
+    os.makedirs(directory, exist_ok=True)
+    Scraper.GREENHOUSE_DESCRIPTIONS = descriptions
+    companies = split_companies(Scraper.load_companies(), shards)[index]
+    scheduler = BoardScheduler(shard_path(index, shards, directory, 'schedule.json')) if schedule else None
+    metrics = RunMetrics()
+    sink = Scraper.CsvSink(shard_path(index, shards, directory), drop_hidden=False)
+    count = Scraper.stream_jobs(sink, scheduler=scheduler, metrics=metrics, companies=companies)
+    with open(shard_path(index, shards, directory, 'boards.json'), 'w') as f:
+        json.dump(sorted(sink.boards), f)
+    metrics.write_report(shard_path(index, shards, directory, 'report.json'))
+    return count
+
+def load_shard_boards(partials):
+    """(system, board) pairs fetched by the shards of the given partial CSVs.
+
+    A shard that died before writing its list contributes none, so its
+    boards keep their jobs open.
+    """
+    boards = set()
+    for partial in partials:
+        path = partial[:-len('csv')] + 'boards.json'
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                boards.update(tuple(board) for board in json.load(f))
+    return boards
+
+def merge_shards(directory=SHARD_DIR, store_path=STORE_PATH, snapshot=False):
+    """Combines every partial CSV in `directory` into the job store (and a snapshot)."""
+    import pandas as pd
+
+    partials = sorted(os.path.join(directory, f) for f in os.listdir(directory)
+                      if f.startswith('shard_') and f.endswith('.csv'))
+    frames = [pd.read_csv(p, keep_default_na=False, na_values=['']) for p in partials]
+    frames = [f for f in frames if not f.empty]
+    boards = load_shard_boards(partials)
+    if not frames and not boards:
+        print("No shard output to merge.")
+        return None
+
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=Scraper.RECORD_FIELDS)
+    df = df.astype(object).where(df.notna(), None)
+    df = pd.DataFrame(list(Scraper.load_deduplicator(store_path).dedupe(df.to_dict('records'))))
+    with JobStore(store_path) as store:
+        upserted, closed = store.sync(df.to_dict('records'), boards)
+    print(f"Merged {len(partials)} shards: {upserted} jobs stored in {store_path} ({closed} closed)")
+    if snapshot and not df.empty:
+        Scraper.write_parquet(df)
+    for p in partials:
+        os.remove(p)
+        if os.path.exists(p[:-len('csv')] + 'boards.json'):
+            os.remove(p[:-len('csv')] + 'boards.json')
+    return df
+
+def run_local(shards, directory=SHARD_DIR, schedule=False, snapshot=False, descriptions=False):
+    """Runs every shard in a local process pool, then merges them."""
+    with ProcessPoolExecutor(max_workers=shards) as pool:
+        counts = list(pool.map(run_shard, range(shards), [shards] * shards, [directory] * shards,
+                               [schedule] * shards, [descriptions] * shards))
+    print(f"Shards finished: {counts}")
+    return merge_shards(directory, snapshot=snapshot)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sharded scraping across processes or machines.")
+    parser.add_argument('--dir', default=SHARD_DIR, help="where partial outputs are written")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help="scrape a single shard")
+    run.add_argument('--shard', type=int, required=True)
+    run.add_argument('--of', type=int, required=True, dest='shards')
+    run.add_argument('--schedule', action='store_true', help="only fetch boards that are due")
+    run.add_argument('--descriptions', action='store_true', help="also fetch Greenhouse descriptions")
+
+    merge = sub.add_parser('merge', help="merge finished shards into the job store")
+    merge.add_argument('--snapshot', action='store_true', help="also write a Parquet snapshot")
+
+    local = sub.add_parser('local', help="run all shards in a local process pool and merge")
+    local.add_argument('--shards', type=int, default=os.cpu_count())
+    local.add_argument('--schedule', action='store_true')
+    local.add_argument('--snapshot', action='store_true')
+    local.add_argument('--descriptions', action='store_true')
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        run_shard(args.shard, args.shards, args.dir, args.schedule, args.descriptions)
+    elif args.command == 'merge':
+        merge_shards(args.dir, snapshot=args.snapshot)
+    else:
+        run_local(args.shards, args.dir, args.schedule, args.snapshot, args.descriptions)
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,15 @@
 import os
+import threading
+import time
+import numpy as np
 import pandas as pd
-from dash import Dash, dcc, html, Input, Output, ctx
+from dash import Dash, dcc, html, Input, Output, State, ALL, ctx, no_update
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 
+from HiddenJobs import HiddenJobs
+from JobStore import JobStore, STORE_PATH
+
 def load_latest_csv():
     csv_files = [f for f in os.listdir('.') if f.startswith('jobs_') and f.endswith('.csv')]
     if not csv_files:
@@ -14,9 +20,173 @@ def load_latest_csv():
     df['posted_date'] = pd.to_datetime(df['posted_date'], errors='coerce')
     return df
 
-df = load_latest_csv()
+# Columns the dashboard actually reads; Parquet snapshots load only these.
+DASHBOARD_COLUMNS = ['title', 'company', 'location', 'url', 'level',
+                     'is_remote', 'posted_date', 'scraped_at']
+
+def load_latest_parquet():
+    files = [f for f in os.listdir('.') if f.startswith('jobs_') and f.endswith('.parquet')]
+    if not files:
+        raise FileNotFoundError("No Parquet snapshot found.")
+    latest = sorted(files)[-1]
+    return pd.read_parquet(latest, columns=DASHBOARD_COLUMNS, memory_map=True)
+
+def load_latest_snapshot():
+    """Loads the newest jobs_* snapshot, preferring Parquet over CSV from the same run."""
+    snapshots = [f for f in os.listdir('.') if f.startswith('jobs_') and f.endswith(('.csv', '.parquet'))]
+    if not snapshots:
+        raise FileNotFoundError("No CSV found.")
+    latest = max(snapshots, key=lambda f: (os.path.splitext(f)[0], f.endswith('.parquet')))
+    if latest.endswith('.parquet'):
+        return load_latest_parquet()
+    return load_latest_csv()
+
+def date_cutoff(date_filter):
+    """Earliest posted_date kept by a date-posted button, or None for all time."""
+    if date_filter == 'day':
+        return datetime.now() - timedelta(days=1)
+    elif date_filter == 'week':
+        return datetime.now() - timedelta(days=7)
+    return None
+
+def level_buckets(frame):
+    return np.select([frame["level"] == "Senior", frame["level"] == "Junior"],
+                     ["Senior", "Junior"], "Mid-Level")
+
+def build_count_cube(frame):
+    """Job counts per (level bucket, is_remote, posted day), computed once per load."""
+    cube = frame.groupby([
+        pd.Series(level_buckets(frame), index=frame.index, name='bucket'),
+        frame['is_remote'].astype(bool).rename('is_remote'),
+        frame['posted_date'].dt.floor('D').rename('day'),
+    ], dropna=False, observed=True).size()
+    return cube.rename('count').reset_index()
+
+def breakdown_counts(cube, date_filter):
+    """(level bucket, is_remote) -> count for a date-posted button, answered from the cube."""
+    cutoff = date_cutoff(date_filter)
+    rows = cube if cutoff is None else cube[cube['day'] >= cutoff]
+    counts = {(b, r): 0 for b in ("Senior", "Mid-Level", "Junior") for r in (False, True)}
+    for (bucket, remote), n in rows.groupby(['bucket', 'is_remote'])['count'].sum().items():
+        counts[(bucket, bool(remote))] = int(n)
+    return counts
+
+# Seconds between checks for a newer store write or snapshot.
+RELOAD_INTERVAL = 30
+
+class DashboardData:
+    """A jobs frame together with the structures precomputed from it."""
+
+    def __init__(self, frame):
+        self.df = frame.reset_index(drop=True)
+        self.count_cube = build_count_cube(self.df)
+        self.url_index = pd.Index(self.df['url'])
+
+class DataSource:
+    """Serves the latest jobs to callbacks and reloads them in the background.
+
+    Callbacks read `current` once and use that object throughout, and a
+    reload swaps in a fully built DashboardData in a single assignment, so a
+    request never sees a half-loaded state. Store updates are merged
+    incrementally via JobStore.changes_since; snapshots are reloaded whole.
+    Hidden jobs are dropped on load and removed in place when hidden.
+    """
 
-app = Dash(__name__)
+    def __init__(self, interval=RELOAD_INTERVAL):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._signature = self._source_signature()
+        self._watermark = None
+        self.current = DashboardData(self._load_full())
+
+    def _source_signature(self):
+        if os.path.exists(STORE_PATH):
+            paths = [STORE_PATH, STORE_PATH + '-wal']
+        else:
+            paths = sorted(f for f in os.listdir('.') if f.startswith('jobs_')
+                           and f.endswith(('.csv', '.parquet')))[-2:]
+        return tuple((p, os.stat(p).st_mtime_ns, os.stat(p).st_size)
+                     for p in paths if os.path.exists(p))
+
+    def _load_full(self):
+        if os.path.exists(STORE_PATH):
+            with JobStore(STORE_PATH) as store:
+                self._watermark = store.watermark()
+                frame = store.open_jobs()
+        else:
+            frame = load_latest_snapshot()
+        with HiddenJobs() as hidden:
+            return hidden.drop(frame)
+
+    def _load_store_delta(self):
+        with JobStore(STORE_PATH) as store:
+            watermark = store.watermark()
+            changes = store.changes_since(self._watermark)
+        frame = self.current.df
+        frame = frame[~frame['url'].isin(changes['url'])]
+        opened = changes[changes['closed_at'].isna()].drop(columns='closed_at')
+        with HiddenJobs() as hidden:
+            opened = hidden.drop(opened)
+        self._watermark = watermark
+        return pd.concat([opened, frame], ignore_index=True)
+
+    def refresh(self):
+        """Reloads if the underlying store or snapshot changed. Returns True on swap."""
+        signature = self._source_signature()
+        if signature == self._signature:
+            return False
+        with self._lock:
+            if self._watermark is not None and os.path.exists(STORE_PATH):
+                frame = self._load_store_delta()
+            else:
+                frame = self._load_full()
+            self.current = DashboardData(frame)
+            self._signature = signature
+        return True
+
+    def search(self, data, text):
+        """Row positions in `data` of the jobs matching a search string, best first.
+
+        Runs against the store's full-text index; returns None without a store.
+        """
+        if not os.path.exists(STORE_PATH):
+            return None
+        with JobStore(STORE_PATH) as store:
+            urls = store.search(text)
+        positions = data.url_index.get_indexer(urls)
+        return positions[positions >= 0]
+
+    def hide(self, urls):
+        """Persists hidden URLs and drops them from the served data."""
+        with HiddenJobs() as hidden:
+            hidden.hide(urls)
+        with self._lock:
+            df = self.current.df
+            self.current = DashboardData(df[~df['url'].isin(urls)])
+
+    def unhide(self, urls):
+        """Un-hides URLs, reloading in full if any were actually hidden."""
+        with HiddenJobs() as hidden:
+            restored = hidden.unhide(urls)
+        if restored:
+            with self._lock:
+                self.current = DashboardData(self._load_full())
+
+    def _watch(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                if self.refresh():
+                    print(f"Reloaded {len(self.current.df)} jobs.")
+            except Exception as e:
+                print(f"Reload failed, keeping current data: {e}")
+
+    def start(self):
+        threading.Thread(target=self._watch, daemon=True).start()
+        return self
+
+# The DataSource the callbacks read from; set by create_app.
+source = None
 
 colors = {
     'background': "#e7e5df",
@@ -29,14 +199,11 @@ colors = {
     'border': '#44bba4'
 }
 
-def create_breakdown_figure(filtered_df):
-    """Create the breakdown figure based on filtered data"""
-    junior_remote = filtered_df[(filtered_df["level"] == "Junior") & (filtered_df["is_remote"] == True)]
-    junior_onsite = filtered_df[(filtered_df["level"] == "Junior") & (filtered_df["is_remote"] == False)]
-    mid_remote = filtered_df[((filtered_df["level"] != "Junior") & (filtered_df["level"] != "Senior")) & (filtered_df["is_remote"] == True)]
-    mid_onsite = filtered_df[((filtered_df["level"] != "Junior") & (filtered_df["level"] != "Senior")) & (filtered_df["is_remote"] == False)]
-    senior_remote = filtered_df[(filtered_df["level"] == "Senior") & (filtered_df["is_remote"] == True)]
-    senior_onsite = filtered_df[(filtered_df["level"] != "Senior") & (filtered_df["is_remote"] == False)]
+def create_breakdown_figure(counts):
+    """Create the breakdown figure from (level bucket, is_remote) counts"""
+    senior_onsite, senior_remote = counts[("Senior", False)], counts[("Senior", True)]
+    mid_onsite, mid_remote = counts[("Mid-Level", False)], counts[("Mid-Level", True)]
+    junior_onsite, junior_remote = counts[("Junior", False)], counts[("Junior", True)]
 
     breakdown_data = {
         'Category': [
@@ -47,18 +214,18 @@ def create_breakdown_figure(filtered_df):
         ],
         
         'Count': [
-            len(filtered_df),
-            len(senior_onsite) + len(senior_remote),
-            len(senior_onsite),
-            len(senior_remote),
+            sum(counts.values()),
+            senior_onsite + senior_remote,
+            senior_onsite,
+            senior_remote,
             
-            len(mid_onsite) + len(mid_remote),
-            len(mid_onsite),
-            len(mid_remote),
+            mid_onsite + mid_remote,
+            mid_onsite,
+            mid_remote,
             
-            len(junior_onsite) + len(junior_remote),
-            len(junior_onsite),
-            len(junior_remote)
+            junior_onsite + junior_remote,
+            junior_onsite,
+            junior_remote
         ],
 
         'Color': [
@@ -108,214 +275,305 @@ def create_breakdown_figure(filtered_df):
     )
     return fig
 
-fig_junior = create_breakdown_figure(df)
+# Trend chart windows: key -> (label, days or None for all history)
+TREND_RANGES = {
+    '30': ("30 days", 30),
+    '90': ("90 days", 90),
+    '365': ("1 year", 365),
+    'all': ("All", None),
+}
+
+def load_rollups(days):
+    """Daily rollup rows of the last `days` days from the store, or None without one."""
+    if not os.path.exists(STORE_PATH):
+        return None
+    since = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d') if days else None
+    with JobStore(STORE_PATH) as store:
+        return store.rollups(since)
+
+def trend_layout(fig, title):
+    fig.update_layout(
+        title=dict(text=title, font=dict(size=20, color=colors['text'])),
+        paper_bgcolor=colors['surface'],
+        plot_bgcolor=colors['surface'],
+        font=dict(color=colors['text']),
+        xaxis=dict(gridcolor=colors['border']),
+        yaxis=dict(title="Number of Jobs", gridcolor=colors['border'], showgrid=True),
+        margin=dict(l=60, r=20, t=60, b=60),
+        hoverlabel=dict(bgcolor=colors['primary'], font_size=14)
+    )
+    return fig
+
+def create_trend_figures(rollups):
+    """Open postings per level bucket, and postings opened / closed, per day."""
+    open_fig, flow_fig = go.Figure(), go.Figure()
+    if rollups is None or rollups.empty:
+        return (trend_layout(open_fig, "Open Jobs Over Time (no history yet)"),
+                trend_layout(flow_fig, "Jobs Opened & Closed (no history yet)"))
+
+    by_level = rollups.groupby(['day', level_buckets(rollups)])['open'].sum().unstack(fill_value=0)
+    for bucket, color in (("Senior", '#F17105'), ("Mid-Level", '#1a8fe3'), ("Junior", '#00A6A6')):
+        if bucket in by_level:
+            open_fig.add_trace(go.Scatter(x=by_level.index, y=by_level[bucket], name=bucket,
+                                          mode='lines', stackgroup='open', line=dict(color=color)))
+
+    flow = rollups.groupby('day')[['opened', 'closed']].sum()
+    flow_fig.add_trace(go.Bar(x=flow.index, y=flow['opened'], name="Opened", marker_color=colors['primary']))
+    flow_fig.add_trace(go.Bar(x=flow.index, y=-flow['closed'], name="Closed", marker_color='#D11149',
+                              customdata=flow['closed'], hovertemplate='%{x}<br>Closed: %{customdata}<extra></extra>'))
+    flow_fig.update_layout(barmode='relative')
+    return (trend_layout(open_fig, "Open Jobs Over Time"),
+            trend_layout(flow_fig, "Jobs Opened & Closed"))
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+# key -> (label, column, ascending); "relevance" keeps search rank order
+SORT_OPTIONS = {
+    'relevance': ("Best match", None, True),
+    'newest': ("Newest first", 'posted_date', False),
+    'oldest': ("Oldest first", 'posted_date', True),
+    'company': ("Company (A-Z)", 'company', True),
+    'title': ("Title (A-Z)", 'title', True),
+}
+
+page_button_style = {
+    "padding": "6px 14px",
+    "backgroundColor": colors['accent'],
+    "color": "white",
+    "border": "none",
+    "borderRadius": "5px",
+    "cursor": "pointer"
+}
+
+def date_mask(frame, date_filter):
+    """Boolean mask for the date-posted buttons."""
+    cutoff = date_cutoff(date_filter)
+    if cutoff is None:
+        return pd.Series(True, index=frame.index)
+    return frame['posted_date'] >= cutoff
+
+def category_mask(frame, label):
+    """Boolean mask for a breakdown chart label such as "Mid-Level - Remote"."""
+    bucket, _, where = label.partition(" - ")
+    if bucket == "Senior":
+        mask = frame["level"] == "Senior"
+    elif bucket == "Junior":
+        mask = frame["level"] == "Junior"
+    elif bucket == "Mid-Level":
+        mask = ~frame["level"].isin(["Senior", "Junior"])
+    else:
+        return pd.Series(True, index=frame.index)
+
+    if where == "Remote":
+        mask &= frame["is_remote"]
+    elif where == "Onsite":
+        mask &= ~frame["is_remote"]
+    return mask
+
+def page_positions(frame, mask, sort_key, page, page_size):
+    """Row positions of one sorted page of the masked rows, plus the match count."""
+    _, column, ascending = SORT_OPTIONS.get(sort_key, SORT_OPTIONS['newest'])
+    positions = np.flatnonzero(mask.to_numpy())
+    if column is None:
+        start = page * page_size
+        return positions[start:start + page_size], len(positions)
+    keys = frame[column].iloc[positions].reset_index(drop=True)
+    order = keys.sort_values(ascending=ascending, na_position='last', kind='stable').index
+    start = page * page_size
+    return positions[order[start:start + page_size]], len(positions)
 
 # App Layout
-app.layout = html.Div([
-    dcc.Store(id='date-filter-state', data='all'),
-    
-    html.Div([
-        html.H1("Job Search Dashboard", 
-                style={
-                    "textAlign": "center",
-                    "color": colors['text'],
-                    "marginBottom": "10px",
-                    "fontSize": "2.5rem",
-                    "fontWeight": "700"
-                }),
-        html.P(f"Total Jobs Found: {len(df)} | Last Updated: {df['scraped_at'].iloc[0] if len(df) > 0 else 'N/A'}",
-               style={
-                   "textAlign": "center",
-                   "color": colors['text_secondary'],
-                   "fontSize": "1.1rem"
-               })
-    ], style={
-        "padding": "30px 20px",
-        "backgroundColor": colors['background'],
-        "borderBottom": f"2px solid {colors['border']}"
-    }),
-
-    html.Div([
-        html.H3("Filter by Date Posted:", 
-                style={
-                    "color": colors['text'],
-                    "marginBottom": "15px",
-                    "fontSize": "1.3rem"
-                }),
-        html.Div([
-            html.Button("Last 24 Hours", id="btn-day", n_clicks=0,
-                       style={
-                           "padding": "10px 20px",
-                           "margin": "5px",
-                           "backgroundColor": colors['primary'],
-                           "color": "white",
-                           "border": "none",
-                           "borderRadius": "5px",
-                           "cursor": "pointer",
-                           "fontSize": "1rem",
-                           "fontWeight": "500"
-                       }),
-            html.Button("Last 7 Days", id="btn-week", n_clicks=0,
-                       style={
-                           "padding": "10px 20px",
-                           "margin": "5px",
-                           "backgroundColor": colors['secondary'],
-                           "color": "white",
-                           "border": "none",
-                           "borderRadius": "5px",
-                           "cursor": "pointer",
-                           "fontSize": "1rem",
-                           "fontWeight": "500"
-                       }),
-            html.Button("All Time", id="btn-all", n_clicks=0,
-                       style={
-                           "padding": "10px 20px",
-                           "margin": "5px",
-                           "backgroundColor": colors['accent'],
-                           "color": "white",
-                           "border": "none",
-                           "borderRadius": "5px",
-                           "cursor": "pointer",
-                           "fontSize": "1rem",
-                           "fontWeight": "500"
-                       })
-        ], style={"display": "flex", "justifyContent": "center", "flexWrap": "wrap"})
-    ], style={
-        "padding": "20px",
-        "backgroundColor": colors['background'],
-        "textAlign": "center"
-    }),
+def serve_layout():
+    """Builds the page from the data current at page load."""
+    df = source.current.df
+    fig_junior = create_breakdown_figure(breakdown_counts(source.current.count_cube, 'all'))
 
-    html.Div([
+    return html.Div([
+        dcc.Store(id='date-filter-state', data='all'),
+        dcc.Store(id='page-state', data=0),
+    
         html.Div([
-            dcc.Graph(id="junior", figure=fig_junior, style={"height": "500px"})
-        ], style={"padding": "20px"}),
-    ], style={
-        "display": "grid",
-        "gridTemplateColumns": "repeat(auto-fit, minmax(400px, 1fr))",
-        "gap": "20px",
-        "backgroundColor": colors['background'],
-        "padding": "20px"
-    }),
+            html.H1("Job Search Dashboard", 
+                    style={
+                        "textAlign": "center",
+                        "color": colors['text'],
+                        "marginBottom": "10px",
+                        "fontSize": "2.5rem",
+                        "fontWeight": "700"
+                    }),
+            html.P(f"Total Jobs Found: {len(df)} | Last Updated: {df['scraped_at'].iloc[0] if len(df) > 0 else 'N/A'}",
+                   style={
+                       "textAlign": "center",
+                       "color": colors['text_secondary'],
+                       "fontSize": "1.1rem"
+                   })
+        ], style={
+            "padding": "30px 20px",
+            "backgroundColor": colors['background'],
+            "borderBottom": f"2px solid {colors['border']}"
+        }),
 
-    html.Div([
         html.Div([
-            html.H2("Job Listings", 
+            html.H3("Filter by Date Posted:", 
                     style={
                         "color": colors['text'],
-                        "marginBottom": "20px",
-                        "fontSize": "1.8rem"
+                        "marginBottom": "15px",
+                        "fontSize": "1.3rem"
                     }),
-            html.P("Click on any chart segment to filter jobs. Click again to reset.",
-                style={"color": colors['text_secondary'], "marginBottom": "20px"})
-        ], style={"padding": "20px 30px"}),
+            html.Div([
+                html.Button("Last 24 Hours", id="btn-day", n_clicks=0,
+                           style={
+                               "padding": "10px 20px",
+                               "margin": "5px",
+                               "backgroundColor": colors['primary'],
+                               "color": "white",
+                               "border": "none",
+                               "borderRadius": "5px",
+                               "cursor": "pointer",
+                               "fontSize": "1rem",
+                               "fontWeight": "500"
+                           }),
+                html.Button("Last 7 Days", id="btn-week", n_clicks=0,
+                           style={
+                               "padding": "10px 20px",
+                               "margin": "5px",
+                               "backgroundColor": colors['secondary'],
+                               "color": "white",
+                               "border": "none",
+                               "borderRadius": "5px",
+                               "cursor": "pointer",
+                               "fontSize": "1rem",
+                               "fontWeight": "500"
+                           }),
+                html.Button("All Time", id="btn-all", n_clicks=0,
+                           style={
+                               "padding": "10px 20px",
+                               "margin": "5px",
+                               "backgroundColor": colors['accent'],
+                               "color": "white",
+                               "border": "none",
+                               "borderRadius": "5px",
+                               "cursor": "pointer",
+                               "fontSize": "1rem",
+                               "fontWeight": "500"
+                           })
+            ], style={"display": "flex", "justifyContent": "center", "flexWrap": "wrap"})
+        ], style={
+            "padding": "20px",
+            "backgroundColor": colors['background'],
+            "textAlign": "center"
+        }),
+
+        html.Div([
+            html.Div([
+                dcc.Graph(id="junior", figure=fig_junior, style={"height": "500px"})
+            ], style={"padding": "20px"}),
+            html.Div([
+                dcc.RadioItems(
+                    id="trend-range",
+                    options=[{"label": label, "value": key} for key, (label, _) in TREND_RANGES.items()],
+                    value='90', inline=True,
+                    style={"color": colors['text']}, inputStyle={"margin": "0 5px 0 15px"}
+                ),
+                dcc.Graph(id="trend-open", style={"height": "240px"}),
+                dcc.Graph(id="trend-flow", style={"height": "240px"}),
+            ], style={"padding": "20px"}),
+        ], style={
+            "display": "grid",
+            "gridTemplateColumns": "repeat(auto-fit, minmax(400px, 1fr))",
+            "gap": "20px",
+            "backgroundColor": colors['background'],
+            "padding": "20px"
+        }),
+
+        html.Div([
+            html.Div([
+                html.H2("Job Listings", 
+                        style={
+                            "color": colors['text'],
+                            "marginBottom": "20px",
+                            "fontSize": "1.8rem"
+                        }),
+                html.P("Click on any chart segment to filter jobs. Click again to reset.",
+                    style={"color": colors['text_secondary'], "marginBottom": "20px"}),
+                dcc.Input(
+                    id="search", type="search", debounce=True,
+                    placeholder='Search jobs, e.g. python "data platform" company:stripe location:remote',
+                    style={"width": "100%", "maxWidth": "700px", "padding": "8px"}
+                ),
+            ], style={"padding": "20px 30px"}),
         
-        html.Div(id="results", style={"padding": "0 30px 30px 30px"})
+            html.Div([
+                html.Label("Sort by:", style={"color": colors['text'], "marginRight": "8px"}),
+                dcc.Dropdown(
+                    id="sort-by",
+                    options=[{"label": label, "value": key} for key, (label, _, _) in SORT_OPTIONS.items()],
+                    value="relevance", clearable=False,
+                    style={"width": "200px", "marginRight": "20px"}
+                ),
+                html.Label("Per page:", style={"color": colors['text'], "marginRight": "8px"}),
+                dcc.Dropdown(
+                    id="page-size",
+                    options=[{"label": str(n), "value": n} for n in PAGE_SIZES],
+                    value=PAGE_SIZES[1], clearable=False,
+                    style={"width": "90px", "marginRight": "20px"}
+                ),
+                html.Button("Previous", id="btn-prev", n_clicks=0, style=page_button_style),
+                html.Span(id="page-info", style={"color": colors['text_secondary'], "margin": "0 10px"}),
+                html.Button("Next", id="btn-next", n_clicks=0, style=page_button_style),
+                html.Span(id="hide-status", style={"color": colors['text_secondary'], "marginLeft": "20px"}),
+            ], style={"display": "flex", "alignItems": "center", "flexWrap": "wrap",
+                      "padding": "0 30px 20px 30px"}),
+
+            html.Div(id="results", style={"padding": "0 30px 30px 30px"})
+        ], style={
+            "backgroundColor": colors['background'],
+            "minHeight": "400px"
+        })
     ], style={
         "backgroundColor": colors['background'],
-        "minHeight": "400px"
-    })
-], style={
-    "backgroundColor": colors['background'],
-    "minHeight": "100vh",
-    "fontFamily": "-apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif"
-    
-})
-
-@app.callback(
-    Output('date-filter-state', 'data'),
-    [Input("btn-day", "n_clicks"),
-     Input("btn-week", "n_clicks"),
-     Input("btn-all", "n_clicks")]
-)
-def update_date_filter(btn_day, btn_week, btn_all):
-    if not ctx.triggered:
-        return 'all'
-    
-    button_id = ctx.triggered_id
-    
-    if button_id == "btn-day":
-        return 'day'
-    elif button_id == "btn-week":
-        return 'week'
-    elif button_id == "btn-all":
-        return 'all'
+        "minHeight": "100vh",
+        "fontFamily": "-apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif"
     
-    return 'all'
+    })
+
+def render_jobs(data, date_filter, label, sort_key, page_size, page, trigger=None, matches=None):
+    """Chart, job list page, page info and page number for one filter state.
+
+    `matches` are the row positions of search hits in rank order; when given,
+    only those rows are filtered and sorted.
+    """
+    if matches is not None:
+        df = data.df.iloc[matches]
+    else:
+        df = data.df
+        if sort_key == 'relevance':
+            sort_key = 'newest'
+
+    # Filters are boolean masks over the shared frame; only the visible page is materialized.
+    mask = date_mask(df, date_filter)
 
-@app.callback(
-    [Output("junior", "figure"),
-     Output("results", "children")],
-    [Input('date-filter-state', 'data'),
-     Input("junior", "clickData")]
-)
-def filter_jobs(date_filter, junior_click):
-    # Apply date filter first
-    date_filtered = df.copy()
-    
-    if date_filter == 'day':
-        cutoff_date = datetime.now() - timedelta(days=1)
-        date_filtered = date_filtered[date_filtered['posted_date'] >= cutoff_date]
-    elif date_filter == 'week':
-        cutoff_date = datetime.now() - timedelta(days=7)
-        date_filtered = date_filtered[date_filtered['posted_date'] >= cutoff_date]
-    
     # Always create chart based on date-filtered data (shows all categories)
-    updated_fig = create_breakdown_figure(date_filtered)
-    
+    updated_fig = create_breakdown_figure(breakdown_counts(data.count_cube, date_filter))
+
     # For job listings, apply both date AND chart click filters
-    results_filtered = date_filtered.copy()
-    
-    if junior_click:
-        label = junior_click["points"][0]["y"]
-
-        if label == "Senior - All":
-            results_filtered = results_filtered[results_filtered["level"] == "Senior"]
-
-        elif label == "Senior - Remote":
-            results_filtered = results_filtered[
-                (results_filtered["level"] == "Senior") &
-                (results_filtered["is_remote"] == True)
-            ]
-
-        elif label == "Senior - Onsite":
-            results_filtered = results_filtered[
-                (results_filtered["level"] == "Senior") &
-                (results_filtered["is_remote"] == False)
-            ]
-            
-        elif label == "Mid-Level - All":
-            results_filtered = results_filtered[((results_filtered["level"] != "Senior") & (results_filtered["level"] != "Junior"))]
-
-        elif label == "Mid-Level - Remote":
-            results_filtered = results_filtered[
-                ((results_filtered["level"] != "Senior") & (results_filtered["level"] != "Junior")) &
-                (results_filtered["is_remote"] == True)
-            ]
-
-        elif label == "Mid-Level - Onsite":
-            results_filtered = results_filtered[
-                ((results_filtered["level"] != "Senior") & (results_filtered["level"] != "Junior")) &
-                (results_filtered["is_remote"] == False)
-            ]
-        
-        elif label == "Junior - All":
-            results_filtered = results_filtered[results_filtered["level"] == "Junior"]
-
-        elif label == "Junior - Remote":
-            results_filtered = results_filtered[
-                (results_filtered["level"] == "Junior") &
-                (results_filtered["is_remote"] == True)
-            ]
-            
-        elif label == "Junior - Onsite":
-            results_filtered = results_filtered[
-                (results_filtered["level"] == "Junior") &
-                (results_filtered["is_remote"] == False)
-            ]
+    if label:
+        mask = mask & category_mask(df, label)
 
-    if results_filtered.empty:
-        return updated_fig, html.P("No jobs match this filter.", style={"color": colors['text']})
+    total = int(mask.sum())
+    last_page = max((total - 1) // page_size, 0)
+    if trigger == "btn-next":
+        page = min(page + 1, last_page)
+    elif trigger == "btn-prev":
+        page = max(page - 1, 0)
+    else:
+        page = 0
+
+    if total == 0:
+        return updated_fig, html.P("No jobs match this filter.", style={"color": colors['text']}), "", 0
+
+    positions, _ = page_positions(df, mask, sort_key, page, page_size)
+    page_df = df.iloc[positions]
 
     job_listings = [
         html.Div([
@@ -332,10 +590,97 @@ def filter_jobs(date_filter, junior_click):
                 style={"color": colors['primary'], "textDecoration": "none"}
             )
         ], style={"margin-bottom": "5px", "display": "flex", "alignItems": "center"})
-        for idx, row in results_filtered.iterrows()
+        for idx, row in page_df.iterrows()
     ]
 
-    return updated_fig, job_listings
+    page_info = f"Page {page + 1} of {last_page + 1} ({total} jobs)"
+    return updated_fig, job_listings, page_info, page
+
+def update_date_filter(btn_day, btn_week, btn_all):
+    if not ctx.triggered:
+        return 'all'
+    
+    button_id = ctx.triggered_id
+    
+    if button_id == "btn-day":
+        return 'day'
+    elif button_id == "btn-week":
+        return 'week'
+    elif button_id == "btn-all":
+        return 'all'
+    
+    return 'all'
+
+def update_trends(trend_range):
+    _, days = TREND_RANGES.get(trend_range, TREND_RANGES['90'])
+    return create_trend_figures(load_rollups(days))
+
+def filter_jobs(date_filter, junior_click, sort_key, page_size, _prev, _next, query, page):
+    label = junior_click["points"][0]["y"] if junior_click else None
+    data = source.current
+    matches = source.search(data, query) if query and query.strip() else None
+    return render_jobs(data, date_filter, label, sort_key, page_size, page, ctx.triggered_id, matches)
+
+def hide_jobs(values, options, ids):
+    """Writes a ticked (or un-ticked) checkbox to the hidden-jobs store."""
+    if ctx.triggered_id not in ids:
+        return no_update
+    i = ids.index(ctx.triggered_id)
+    url = options[i][0]["value"]
+    if values[i]:
+        source.hide([url])
+        return "Hidden. It won't be shown again."
+    source.unhide([url])
+    return ""
+
+def register_callbacks(app):
+    """Wires the module's callbacks to `app`."""
+    app.callback(
+        Output('date-filter-state', 'data'),
+        [Input("btn-day", "n_clicks"),
+         Input("btn-week", "n_clicks"),
+         Input("btn-all", "n_clicks")]
+    )(update_date_filter)
+
+    app.callback(
+        [Output("junior", "figure"),
+         Output("results", "children"),
+         Output("page-info", "children"),
+         Output("page-state", "data")],
+        [Input('date-filter-state', 'data'),
+         Input("junior", "clickData"),
+         Input("sort-by", "value"),
+         Input("page-size", "value"),
+         Input("btn-prev", "n_clicks"),
+         Input("btn-next", "n_clicks"),
+         Input("search", "value")],
+        [State("page-state", "data")]
+    )(filter_jobs)
+
+    app.callback(
+        [Output("trend-open", "figure"),
+         Output("trend-flow", "figure")],
+        Input("trend-range", "value")
+    )(update_trends)
+
+    app.callback(
+        Output("hide-status", "children"),
+        Input({'type': 'job-checkbox', 'index': ALL}, "value"),
+        [State({'type': 'job-checkbox', 'index': ALL}, "options"),
+         State({'type': 'job-checkbox', 'index': ALL}, "id")],
+        prevent_initial_call=True
+    )(hide_jobs)
+
+def create_app(data_source=None, watch=True):
+    """Builds the Dash app. Loads the jobs and, if `watch`, starts the reload thread."""
+    global source
+    source = data_source or DataSource()
+    if watch:
+        source.start()
+    app = Dash(__name__)
+    app.layout = serve_layout
+    register_callbacks(app)
+    return app
 
 if __name__ == "__main__":
-    app.run()
\ No newline at end of file
+    create_app().run()
\ No newline at end of file
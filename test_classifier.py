@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+
+from Scraper import TitleClassifier
+
+classifier = TitleClassifier()
+
+@pytest.mark.parametrize('title, level', [
+    # Senior beats Junior beats Mid-Level, otherwise Standard (Mid).
+    ("senior software engineer intern", "Senior"),
+    ("staff engineer ii", "Senior"),
+    ("software engineer i", "Junior"),
+    ("junior engineer ii", "Junior"),
+    ("engineer ii", "Mid-Level"),
+    ("engineer", "Standard (Mid)"),
+    ("sr. backend developer", "Senior"),
+    ("new grad software engineer", "Junior"),
+    ("software engineer iii", "Senior"),
+    ("mid-level frontend engineer", "Mid-Level"),
+    ("software engineer, 3+ years", "Mid-Level"),
+    ("software engineer 5+ years", "Senior"),
+])
+def test_level(title, level):
+    assert classifier.level(title) == level
+
+@pytest.mark.parametrize('title, relevant', [
+    ("software engineer", True),
+    ("full stack developer", True),
+    ("site reliability engineer", True),
+    ("data scientist", True),
+    ("devops lead", True),
+    ("account executive", False),
+    ("recruiter", False),
+    ("product designer", False),
+])
+def test_is_relevant(title, relevant):
+    assert classifier.is_relevant(title) is relevant
+
+@pytest.mark.parametrize('title, location, remote', [
+    ("backend engineer (remote)", "", True),
+    ("backend engineer", "remote - us", True),
+    ("backend engineer", "anywhere", True),
+    ("backend engineer", "work from home", True),
+    ("backend engineer", "new york, ny", False),
+    ("backend engineer", "", False),
+])
+def test_is_remote(title, location, remote):
+    assert classifier.is_remote(title, location) is remote
+
+def test_classify_lowercases():
+    assert classifier.classify("Senior Engineer", "Remote") == ("Senior", True, True)
+    assert classifier.classify("Recruiter") == ("Standard (Mid)", False, False)
+
+def test_classify_series_matches_classify():
+    titles = [
+        "Senior Software Engineer Intern", "Software Engineer I", "Engineer II", "Engineer",
+        "Staff Engineer, Platform", "New Grad SWE", "Backend Engineer (Remote)", "Recruiter",
+        "Data Scientist", "Engineering Manager", "Frontend Developer", None,
+    ]
+    locations = ["Remote - US", "New York, NY", "Anywhere", None, "Berlin, Germany",
+                 "Worldwide", "", "Remote", "London, UK", "Austin, TX", "Distributed", None]
+    labels = classifier.classify_series(pd.Series(titles), pd.Series(locations))
+    expected = [classifier.classify(t or "", l) for t, l in zip(titles, locations)]
+    assert list(labels.itertuples(index=False, name=None)) == expected
+
+def test_classify_series_without_locations():
+    titles = pd.Series(["Remote Engineer", "Engineer"])
+    labels = classifier.classify_series(titles)
+    assert labels['is_remote'].tolist() == [True, False]